@@ -80,6 +80,29 @@ class HydroManipulator:
         return yq
 
 
+    def read_lc_data(self):
+        """
+        Load the lifecycle event schedule from config["lc_path"].
+
+        lc_path may be an EventDate_LC CSV or a lifecycle-partitioned Parquet
+        dataset directory; with the optional config["lc_lifecycles"] = [start, stop]
+        only lifecycles start <= lifecycle < stop are read.
+        """
+        lc_path = self.config["lc_path"]
+        lc_range = self.config.get("lc_lifecycles")
+
+        if os.path.isdir(lc_path):
+            filters = None
+            if lc_range:
+                filters = [("lifecycle", ">=", int(lc_range[0])), ("lifecycle", "<", int(lc_range[1]))]
+            return pd.read_parquet(lc_path, filters=filters).reset_index(drop=True)
+
+        lc_data = pd.read_csv(lc_path)
+        if lc_range:
+            keep = (lc_data["lifecycle"] >= int(lc_range[0])) & (lc_data["lifecycle"] < int(lc_range[1]))
+            lc_data = lc_data.loc[keep].reset_index(drop=True)
+        return lc_data
+
     def list_h5_files(self):
         files = glob.glob(os.path.join(self.config["node_data_path"], "*.h5"))
         return [os.path.basename(f) for f in files]
@@ -57,7 +57,7 @@ def main():
 
     # Load Data Sources
     try:
-        lc_data = pd.read_csv(hm.config["lc_path"])
+        lc_data = hm.read_lc_data()
         adcirc_h5 = h5py.File(os.path.join(hm.config["node_data_path"], adcirc_files[0]), 'r')
         wave_h5 = h5py.File(os.path.join(hm.config["node_data_path"], wave_files[0]), 'r')
     except Exception as e:
@@ -90,6 +90,10 @@ def main():
         print(f"Error locating wave headers: {e}")
         sys.exit(1)
 
+    # Resolve Seed Dates In Bulk (lifecycle schedules with 'event_start', epoch seconds)
+    if "event_start" in lc_data:
+        lc_data["seed_date"] = pd.to_datetime(lc_data["event_start"], unit="s")
+
     # Prepare Data Dictionary
     stm_dic = lc_data.to_dict(orient="records")
 
@@ -128,7 +132,7 @@ def main():
         os.makedirs(output_dir)
 
     # Define Fields To Remove
-    fields_to_remove = ["year_offset", "year", "month", "day", "hour"]
+    fields_to_remove = ["year_offset", "year", "month", "day", "hour", "event_start", "seed_date"]
 
     # Clean up dictionary before writing
     for row in stm_dic:
@@ -169,9 +173,11 @@ def process_single_storm(hm, storm_id, data, adcirc_h5, wave_h5, group_ids, grou
     Processes a single storm event: aligns ADCIRC and Wave model data
     and performs interpolation/downscaling.
     """
-    # Build Seed Date
-    hours, minutes, seconds = parse_hour_float(data["hour"])
-    seed_date = datetime(data["year"], data["month"], data["day"], hours, minutes, seconds)
+    # Build Seed Date (older schedules without 'event_start' are parsed per row)
+    seed_date = data.get("seed_date")
+    if seed_date is None:
+        hours, minutes, seconds = parse_hour_float(data["hour"])
+        seed_date = datetime(data["year"], data["month"], data["day"], hours, minutes, seconds)
 
     # Find the group index for this stormID
     # Assuming stormID matches one of the groupIDs
@@ -0,0 +1,73 @@
+# conversion/lifecycle-generation/benchmarks/bench_arrivals.py
+"""
+Throughput of minimum-separation arrival sampling: the rejection reference
+(lcgen.sampling._sample_with_minimal_arrival) against the exact sampler
+(lcgen.arrivals.SeparatedArrivalSampler), swept over n_storms and
+min_sep_days. Run from conversion/ like main.py.
+"""
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # lcgen, next to main.py
+import lcgen  # noqa: E402
+
+REL_PROB_FILE = "../data/raw/conversion-lifecycle-generation/Relative_probability_bins_Atlantic 4.csv"
+
+N_STORMS = [1, 2, 4, 8, 12, 16]
+MIN_SEP_DAYS = [2.0, 4.0, 7.0, 10.0]
+EXACT_YEARS = 100_000  # years drawn per exact-sampler case
+REJECTION_BUDGET_S = 1.0  # wall-clock budget per rejection case
+SEED = 0
+
+
+def bench_rejection(prob_schedule, n_storms, min_sep_days, rng):
+    n_years = n_failed = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < REJECTION_BUDGET_S:
+        # silence the per-failure report
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            _, _, failed = lcgen.sampling._sample_with_minimal_arrival(
+                n_storms, prob_schedule, min_sep_days, rng
+            )
+        n_years += 1
+        n_failed += failed
+    return n_years / (time.perf_counter() - start), n_failed / n_years
+
+
+def bench_exact(prob_schedule, n_storms, min_sep_days, rng):
+    start = time.perf_counter()
+    sampler = lcgen.arrivals.SeparatedArrivalSampler(prob_schedule, min_sep_days)
+    sampler.sample(n_storms, EXACT_YEARS, rng)
+    return EXACT_YEARS / (time.perf_counter() - start)
+
+
+def main():
+    prob_schedule = lcgen.load.load_relative_probabilities(REL_PROB_FILE)
+    rng = np.random.default_rng(SEED)
+
+    print(
+        f"{'n_storms':>8} {'min_sep':>7} | {'rejection yr/s':>14} {'failed':>7}"
+        f" | {'exact yr/s':>12} {'speedup':>9}"
+    )
+    for min_sep_days in MIN_SEP_DAYS:
+        max_feasible = int(np.floor(len(prob_schedule) / min_sep_days)) + 1
+        for n_storms in N_STORMS:
+            if n_storms > max_feasible:
+                continue
+            rej_rate, rej_failed = bench_rejection(
+                prob_schedule, n_storms, min_sep_days, rng
+            )
+            exact_rate = bench_exact(prob_schedule, n_storms, min_sep_days, rng)
+            print(
+                f"{n_storms:8d} {min_sep_days:7.1f} | {rej_rate:14.0f} {rej_failed:7.1%}"
+                f" | {exact_rate:12.0f} {exact_rate / rej_rate:8.0f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+# conversion/lifecycle-generation/benchmarks/bench_lifecycles.py
+"""
+Throughput benchmark suite for lifecycle generation.
+
+Sweeps NUM_LCS, LIFECYCLE_DURATION, LAM_TARGET and MIN_ARRIVAL_TROP_DAYS one
+at a time around BASE_CASE, on a synthetic seasonal schedule and storm
+catalog, and reports events/s, peak traced memory and the rejection-retry
+count of the reference rejection sampler for each case.
+
+Run from conversion/ like main.py:
+
+    python lifecycle-generation/benchmarks/bench_lifecycles.py --save
+    python lifecycle-generation/benchmarks/bench_lifecycles.py --compare
+
+--save writes the results to BASELINE_FILE; --compare fails (exit 1) when
+any case's events/s drops more than --tolerance below the baseline.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # lcgen, next to main.py
+import lcgen  # noqa: E402
+
+BASELINE_FILE = Path("../data/finished/conversion-lifecycle-generation.bench.json")
+
+BASE_CASE = dict(num_lcs=1000, duration=50, lam=1.7, min_sep_days=7.0)
+SWEEP = {
+    "num_lcs": [100, 1000, 10000],
+    "duration": [25, 50, 100],
+    "lam": [0.5, 1.7, 4.0],
+    "min_sep_days": [2.0, 7.0, 10.0],
+}
+ENGINES = ["batch", "serial"]
+SERIAL_MAX_LCS = 1000  # serial engine is skipped above this size
+
+SYNTHETIC_CATALOG_SIZE = 1050
+REJECTION_YEARS = 200  # years drawn with the rejection reference per case
+INIT_YEAR = 2033
+SEED = 0
+
+
+# -----------------------------
+# SYNTHETIC INPUTS
+# -----------------------------
+def synthetic_schedule() -> pd.DataFrame:
+    """
+    Jun 1 - Nov 30 schedule peaking mid-September, shaped like
+    lcgen.load.load_relative_probabilities output.
+    """
+    dates = pd.date_range("2025-06-01", "2025-11-30", freq="D")
+    doy = dates.dayofyear.to_numpy()
+    weight = np.exp(-0.5 * ((doy - 255) / 30.0) ** 2)
+    return pd.DataFrame(
+        {
+            "month": dates.month,
+            "day": dates.day,
+            "trop_day_cdf": np.cumsum(weight) / weight.sum(),
+            "day_of_year": doy,
+        }
+    )
+
+
+def synthetic_catalog(n_storms: int = SYNTHETIC_CATALOG_SIZE) -> pd.DataFrame:
+    """
+    Heavy-tailed DSW weights, shaped like lcgen.load.load_storm_id_cdf output.
+    """
+    rng = np.random.default_rng(SEED)
+    df = pd.DataFrame(
+        {
+            "storm_id": np.arange(1, n_storms + 1),
+            "dsw": rng.lognormal(mean=-9.0, sigma=2.0, size=n_storms),
+        }
+    )
+    df = df.sort_values(by="dsw").reset_index(drop=True)
+    df["prob"] = df["dsw"] / df["dsw"].sum()
+    df["cdf"] = np.cumsum(df["prob"])
+    return df
+
+
+# -----------------------------
+# CASES
+# -----------------------------
+def sweep_cases() -> list[dict]:
+    cases = [dict(BASE_CASE)]
+    for param, values in SWEEP.items():
+        for value in values:
+            case = dict(BASE_CASE, **{param: value})
+            if case not in cases:
+                cases.append(case)
+    return cases
+
+
+def case_key(engine: str, case: dict) -> str:
+    return (
+        f"{engine}/lcs={case['num_lcs']}/dur={case['duration']}"
+        f"/lam={case['lam']}/sep={case['min_sep_days']}"
+    )
+
+
+def run_engine(engine: str, case: dict, prob_schedule, storm_set, sampler, rng):
+    if engine == "batch":
+        return lcgen.sampling.simulate_lifecycles(
+            n_lifecycles=case["num_lcs"],
+            init_year=INIT_YEAR,
+            duration_years=case["duration"],
+            lam=case["lam"],
+            min_sep_days=case["min_sep_days"],
+            prob_schedule=prob_schedule,
+            storm_set=storm_set,
+            rng=rng,
+            sampler=sampler,
+        )
+    n_events = 0
+    for lc in range(case["num_lcs"]):
+        n_events += len(
+            lcgen.sampling.simulate_lifecycle(
+                lifecycle_index=lc,
+                init_year=INIT_YEAR,
+                duration_years=case["duration"],
+                lam=case["lam"],
+                min_sep_days=case["min_sep_days"],
+                prob_schedule=prob_schedule,
+                storm_set=storm_set,
+                rng=rng,
+                sampler=sampler,
+            )
+        )
+    return n_events
+
+
+def rejection_retries(case: dict, prob_schedule, rng) -> dict:
+    """
+    Mean attempts per storm year and failure rate of the rejection reference.
+    """
+    stats: dict = {}
+    years = 0
+    for _ in range(REJECTION_YEARS):
+        n = lcgen.sampling._sample_storm_count_in_year(
+            case["lam"], prob_schedule, case["min_sep_days"], rng
+        )
+        if n == 0:
+            continue
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            lcgen.sampling._sample_with_minimal_arrival(
+                n, prob_schedule, case["min_sep_days"], rng, stats=stats
+            )
+        years += 1
+    return {
+        "rejection_attempts_per_year": stats.get("attempts", 0) / max(years, 1),
+        "rejection_failure_rate": stats.get("failed", 0) / max(years, 1),
+    }
+
+
+def bench_case(engine: str, case: dict, repeat: int, prob_schedule, storm_set):
+    sampler = lcgen.samplers.EventSampler(prob_schedule, storm_set)
+    # warm-up compiles and caches the arrival tables outside the timings
+    run_engine(engine, dict(case, num_lcs=1), prob_schedule, storm_set, sampler,
+               np.random.default_rng(SEED))
+
+    best = np.inf
+    for r in range(repeat):
+        rng = np.random.default_rng([SEED, r])
+        start = time.perf_counter()
+        out = run_engine(engine, case, prob_schedule, storm_set, sampler, rng)
+        best = min(best, time.perf_counter() - start)
+    n_events = out if isinstance(out, int) else len(out)
+    del out
+
+    tracemalloc.start()
+    run_engine(engine, case, prob_schedule, storm_set, sampler, np.random.default_rng(SEED))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "engine": engine,
+        **case,
+        "events": n_events,
+        "seconds": best,
+        "events_per_s": n_events / best,
+        "peak_mb": peak / 1e6,
+        **rejection_retries(case, prob_schedule, np.random.default_rng(SEED)),
+    }
+
+
+# -----------------------------
+# DRIVER
+# -----------------------------
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (best kept)")
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="compare against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed events/s drop")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    args = parser.parse_args(argv)
+    if args.compare and not args.baseline.exists():
+        parser.error(f"no baseline at {args.baseline}; run with --save first")
+
+    prob_schedule = synthetic_schedule()
+    storm_set = synthetic_catalog()
+
+    results = {}
+    print(
+        f"{'case':<44} {'events/s':>12} {'peak MB':>9} {'rej att/yr':>10} {'rej fail':>8}"
+    )
+    for engine in ENGINES:
+        for case in sweep_cases():
+            if engine == "serial" and case["num_lcs"] > SERIAL_MAX_LCS:
+                continue
+            key = case_key(engine, case)
+            res = bench_case(engine, case, args.repeat, prob_schedule, storm_set)
+            results[key] = res
+            print(
+                f"{key:<44} {res['events_per_s']:12.0f} {res['peak_mb']:9.1f}"
+                f" {res['rejection_attempts_per_year']:10.1f}"
+                f" {res['rejection_failure_rate']:8.1%}"
+            )
+
+    status = 0
+    if args.compare:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        print(f"\n--- Regressions vs {args.baseline} (tolerance {args.tolerance:.0%}) ---")
+        for key, res in results.items():
+            if key not in baseline:
+                continue
+            ratio = res["events_per_s"] / baseline[key]["events_per_s"]
+            if ratio < 1.0 - args.tolerance:
+                status = 1
+                print(f"REGRESSION {key}: {ratio:.2f}x baseline events/s")
+        if status == 0:
+            print("none")
+
+    if args.save:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "python": sys.version.split()[0],
+                    "numpy": np.__version__,
+                    "machine": platform.platform(),
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+        print(f"\nWrote baseline to {args.baseline.resolve()}")
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
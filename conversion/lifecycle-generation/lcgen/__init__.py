@@ -1,5 +1,14 @@
 # conversion/lifecycle-generation/lcgen/__init__.py
+from . import arrivals
+from . import samplers
+from . import results
+from . import ensembles
 from . import sampling
 from . import load
 from . import validation
 from . import utils
+from . import streams
+from . import parallel
+from . import output
+from . import checkpoint
+from . import shards
@@ -0,0 +1,455 @@
+# conversion/lifecycle-generation/lcgen/arrivals.py
+from math import factorial
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# SeparatedArrivalSampler.sample → _tables (built once per n_storms) → _sample_cells
+# JointArrivalSampler.sample → _build_joint_tables (once, grown on demand) → forward pass
+
+# Exact, rejection-free sampling of n storm arrivals t = doy + hour / 24 that
+# are iid from the daily schedule conditioned on all gaps >= min_sep_days.
+#
+# Substituting y_i = t_(i) - i * min_sep_days maps the constrained, sorted
+# arrivals one-to-one onto sorted y_0 <= ... <= y_{n-1} with density
+# prod_i f(y_i + i * min_sep_days). The y axis is cut into cells on which
+# every shifted density is constant; a backward pass over the cells counts
+# the total weight R[c, k] of placing storms k..n-1 in cells >= c, and
+# forward sampling then picks, for each run of storms, the next occupied
+# cell and how many storms share it. Storms sharing a cell are sorted
+# uniforms within it.
+#
+# Several storm types: the per-type shifts would depend on the whole type
+# order, so the joint sampler works on a grid of slots instead, fine enough
+# that every separation is a whole number k of slots. A storm k or more
+# slots after the previous one is feasible; at exactly k it must also lie
+# later within its slot. A backward pass over (remaining counts per type,
+# last type, length of the current run of exact gaps, slot) gives the
+# weight of every continuation, and a forward pass draws type and slot of
+# each storm in turn; positions within slots are uniform, sorted along each
+# run of exact gaps. This is exact and polynomial in the counts.
+
+# Largest hour below 24 that survives the cast to the stored float32 hour
+# (lcgen.results.EVENT_DTYPES); float64 values closer to 24 round up to 24.0.
+HOUR_MAX = float(np.nextafter(np.float32(24.0), np.float32(0.0)))
+
+# uniforms consumed per storm when a sampler is fed pre-drawn uniforms
+UNIFORMS_PER_STORM = 3
+
+
+class SeparatedArrivalSampler:
+    """
+    Sampler of sorted (doy, hour) arrivals with a minimum separation.
+
+    Built once from a daily schedule (as returned by
+    lcgen.load.load_relative_probabilities); tables for each storm count are
+    compiled on first use and cached.
+    """
+
+    def __init__(self, prob_schedule: pd.DataFrame, min_sep_days: float):
+        self.first_day, self.last_day, (self.day_mass,) = _day_masses([prob_schedule])
+        self.min_sep_days = float(min_sep_days)
+        self._cache: dict[int, tuple] = {}
+
+    def sample(
+        self,
+        n_storms: int,
+        size: int,
+        rng: np.random.Generator,
+        u: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Draw 'size' independent years of 'n_storms' arrivals each.
+
+        'u', shape (size, UNIFORMS_PER_STORM * n_storms), supplies the
+        uniforms of every year instead of 'rng'; row i then depends on u[i]
+        only.
+
+        Returns
+        -------
+        doy  : np.ndarray (int), shape (size, n_storms), sorted within rows
+        hour : np.ndarray (float), shape (size, n_storms)
+        """
+        if n_storms <= 0 or size <= 0:
+            return (
+                np.empty((size, max(n_storms, 0)), dtype=int),
+                np.empty((size, max(n_storms, 0)), dtype=float),
+            )
+        shift = np.arange(n_storms) * self.min_sep_days
+        return _sample_cells(self._tables(n_storms), shift, size, rng, u)
+
+    def _tables(self, n_storms: int) -> tuple:
+        if n_storms not in self._cache:
+            self._cache[n_storms] = self._build_tables(n_storms)
+        return self._cache[n_storms]
+
+    def _build_tables(self, n_storms: int) -> tuple:
+        tables = _build_cell_tables(
+            np.broadcast_to(self.day_mass, (n_storms, self.day_mass.size)),
+            np.arange(n_storms) * self.min_sep_days,
+            self.first_day,
+            self.last_day,
+        )
+        if tables[3][0, 0] <= 0.0:
+            raise ValueError(
+                f"cannot place {n_storms} storms {self.min_sep_days} days apart in the schedule"
+            )
+        return tables
+
+
+class JointArrivalSampler:
+    """
+    Sampler of one merged, time-ordered arrival stream over several storm
+    types, each iid from its own daily schedule, conditioned on every pair
+    of consecutive storms being at least min_sep_days[a, b] apart (a the
+    earlier storm's type, b the later one's).
+
+    Separations must satisfy sep[a, c] <= sep[a, b] + sep[b, c], so that
+    consecutive gaps bound every pair, and fall on a grid of whole minutes.
+    One table, sized for the largest counts seen so far, serves every count
+    combination (see reserve).
+    """
+
+    def __init__(
+        self,
+        prob_schedules: Sequence[pd.DataFrame],
+        min_sep_days: np.ndarray,
+    ):
+        self.first_day, self.last_day, self.day_mass = _day_masses(prob_schedules)
+        self.min_sep_days = np.asarray(min_sep_days, dtype=float)
+        n_types = len(prob_schedules)
+        if self.min_sep_days.shape != (n_types, n_types):
+            raise ValueError(f"min_sep_days must be a {n_types} x {n_types} matrix")
+        sep = self.min_sep_days
+        if np.any(sep < 0.0):
+            raise ValueError("min_sep_days must be non-negative")
+        # sep[a, c] <= sep[a, b] + sep[b, c] for every a, b, c
+        if np.any(sep[:, None, :] > sep[:, :, None] + sep[None, :, :] + 1e-9):
+            raise ValueError(
+                f"min_sep_days {sep.tolist()} is not bounded by consecutive gaps:"
+                " a within-type separation may not exceed twice the cross separation"
+            )
+
+        self.slots_per_day = _slots_per_day(sep)
+        self.slot_sep = np.rint(sep * self.slots_per_day).astype(np.int64)
+        self.slot_mass = np.repeat(self.day_mass, self.slots_per_day, axis=1) / float(
+            self.slots_per_day
+        )
+        self._max_counts = np.zeros(n_types, dtype=np.int64)
+        self._table: Optional[tuple] = None
+
+    def reserve(self, counts) -> None:
+        """
+        Size the table for every count combination up to 'counts' (e.g. the
+        per-type maxima of a batch), so it is built once.
+        """
+        counts = np.maximum(self._max_counts, np.asarray(counts, dtype=np.int64))
+        if self._table is None or np.any(counts > self._max_counts):
+            self._max_counts = counts
+            self._table = _build_joint_tables(self.slot_mass, self.slot_sep, counts)
+
+    def sample(
+        self, counts: Sequence[int], size: int, rng: np.random.Generator
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Draw 'size' independent years with counts[t] storms of type t each.
+
+        Returns
+        -------
+        doy        : np.ndarray (int), shape (size, sum(counts)), sorted within rows
+        hour       : np.ndarray (float), shape (size, sum(counts))
+        storm_type : np.ndarray (int8), shape (size, sum(counts))
+        """
+        counts = np.asarray([int(c) for c in counts], dtype=np.int64)
+        n = int(counts.sum())
+        doy = np.empty((size, n), dtype=int)
+        hour = np.empty((size, n), dtype=float)
+        storm_type = np.empty((size, n), dtype=np.int8)
+        if n == 0 or size == 0:
+            return doy, hour, storm_type
+
+        self.reserve(counts)
+        B, suffix, strides = self._table
+        n_types, n_slots = self.slot_mass.shape
+        first = [suffix[counts @ strides - strides[t], t, 0] for t in np.flatnonzero(counts)]
+        if sum(first) <= 0.0:
+            raise ValueError(
+                f"cannot place storm counts {counts.tolist()} with separations "
+                f"{self.min_sep_days.tolist()} in the schedules"
+            )
+
+        slot = np.empty((size, n), dtype=np.int64)
+        new_chain = np.ones((size, n), dtype=bool)
+        p = np.zeros(size, dtype=np.int64)  # slot of the last storm
+        a = np.zeros(size, dtype=np.int64)  # its type
+        chain = np.zeros(size, dtype=np.int64)  # storms in its chain
+        r = np.full(size, int(counts @ strides))  # index of the remaining counts
+        remaining = np.tile(counts, (size, 1))
+
+        for i in range(n):
+            # weight of each (type b, exact / later) next step
+            w = np.zeros((size, 2 * n_types))
+            for t in range(n_types):
+                has = remaining[:, t] > 0
+                rt = np.where(has, r - strides[t], 0)
+                if i == 0:
+                    w[:, 2 * t + 1] = np.where(has, suffix[rt, t, 0], 0.0)
+                    continue
+                exact = p + self.slot_sep[a, t]
+                ok = has & (exact < n_slots)
+                e = np.minimum(exact, n_slots - 1)
+                grown = np.minimum(chain + 1, B.shape[2] - 1)
+                w[:, 2 * t] = np.where(
+                    ok, self.slot_mass[t, e] / (chain + 1) * B[rt, t, grown, e], 0.0
+                )
+                w[:, 2 * t + 1] = np.where(
+                    has, suffix[rt, t, np.minimum(exact + 1, n_slots)], 0.0
+                )
+
+            cdf = np.cumsum(w, axis=1)
+            pick = np.sum(cdf < (rng.random(size) * cdf[:, -1])[:, None], axis=1)
+            np.minimum(pick, 2 * n_types - 1, out=pick)
+            b, is_exact = pick // 2, pick % 2 == 0
+
+            # 'later': a slot past the exact gap, P(q) ∝ slot_mass[b, q] B[., b, 1, q]
+            lo = p + self.slot_sep[a, b] + 1 if i else np.zeros(size, dtype=np.int64)
+            rb = r - strides[b]
+            q = np.where(is_exact, p + self.slot_sep[a, b], 0)
+            later = np.flatnonzero(~is_exact)
+            u = rng.random(later.size)
+            groups = rb[later] * n_types + b[later]
+            for g in np.unique(groups):
+                sel = later[groups == g]
+                neg_suffix = -suffix[g // n_types, g % n_types]
+                target = (1.0 - u[groups == g]) * -neg_suffix[lo[sel]]
+                j = np.searchsorted(neg_suffix, -target, side="left")
+                q[sel] = np.clip(j - 1, lo[sel], n_slots - 1)
+
+            slot[:, i] = q
+            storm_type[:, i] = b
+            new_chain[:, i] = ~is_exact
+            chain = np.where(is_exact, chain + 1, 1)
+            p, a, r = q, b, rb
+            remaining[np.arange(size), b] -= 1
+
+        # positions within slots: iid, sorted along each chain of exact gaps
+        chain_id = np.cumsum(new_chain, axis=1)
+        frac = np.sort(chain_id + rng.random((size, n)), axis=1) - chain_id
+        t = self.first_day + (slot + frac) / self.slots_per_day
+        doy[:] = np.floor(t)
+        hour[:] = (t - doy) * 24.0
+        np.clip(hour, 0.0, HOUR_MAX, out=hour)
+        return doy, hour, storm_type
+
+
+def _slots_per_day(sep: np.ndarray) -> int:
+    """
+    Fewest slots per day (up to one per minute) on which every separation
+    is a whole number of slots.
+    """
+    for slots in range(1, 24 * 60 + 1):
+        if np.allclose(sep * slots, np.rint(sep * slots), rtol=0.0, atol=1e-6):
+            return slots
+    raise ValueError(f"min_sep_days {sep.tolist()} must be whole minutes")
+
+
+def _build_joint_tables(
+    slot_mass: np.ndarray, slot_sep: np.ndarray, max_counts: np.ndarray
+) -> tuple:
+    """
+    Backward pass of the joint sampler over (remaining counts, last type,
+    chain length, slot), for every remaining-count vector up to max_counts.
+
+    B[r, a, l, p] is the weight of placing the storms left in r after a
+    storm of type a in slot p that ends a chain of l storms, each exactly
+    its separation after the previous one. A storm exactly slot_sep[a, b]
+    slots after the last one must also be later within the slot, which
+    costs 1 / (l + 1); any later slot is free. suffix[r, b, p] sums
+    slot_mass[b, q] B[r, b, 1, q] over q >= p.
+
+    Returns (B, suffix, strides); r is the mixed-radix index
+    remaining @ strides.
+    """
+    n_types, n_slots = slot_mass.shape
+    radix = max_counts + 1
+    strides = np.ones(n_types, dtype=np.int64)
+    for t in range(n_types - 2, -1, -1):
+        strides[t] = strides[t + 1] * radix[t + 1]
+    n_max = int(max_counts.sum())
+
+    B = np.zeros((int(np.prod(radix)), n_types, n_max + 1, n_slots))
+    suffix = np.zeros((B.shape[0], n_types, n_slots + 1))
+    chain = np.arange(1, n_max)[:, None]  # l for chains that can grow
+
+    # by total remaining, so r - e_b is always done before r
+    states = sorted(np.ndindex(*radix), key=sum)
+    for remaining in states:
+        r = int(np.dot(remaining, strides))
+        if sum(remaining) == 0:
+            B[r] = 1.0
+        for b in range(n_types):
+            if sum(remaining) == 0 or remaining[b] == 0:
+                continue
+            rb = r - strides[b]
+            for a in range(n_types):
+                k = int(slot_sep[a, b])
+                if k >= n_slots:
+                    continue
+                # next storm in a later slot than the exact gap
+                B[r, a, 1:, : n_slots - k] += suffix[rb, b, k + 1 :]
+                # next storm exactly k slots on, continuing the chain
+                B[r, a, 1:n_max, : n_slots - k] += (
+                    slot_mass[b, k:] / (chain + 1) * B[rb, b, 2:, k:]
+                )
+        for b in range(n_types):
+            suffix[r, b, :n_slots] = np.cumsum((slot_mass[b] * B[r, b, 1])[::-1])[::-1]
+
+    return B, suffix, strides
+
+
+def _day_masses(prob_schedules: Sequence[pd.DataFrame]) -> tuple:
+    """
+    Normalized per-day probability of each schedule on one common day axis.
+
+    Returns
+    -------
+    first_day : int
+    last_day  : int
+    day_mass  : np.ndarray, shape (n_schedules, last_day - first_day + 1)
+    """
+    cdfs = [s["trop_day_cdf"].to_numpy(dtype=float) for s in prob_schedules]
+    doys = [s["day_of_year"].to_numpy().astype(int) for s in prob_schedules]
+    first_day = int(min(d.min() for d in doys))
+    last_day = int(max(d.max() for d in doys))
+
+    # probability density per day (a day is one time unit wide)
+    day_mass = np.zeros((len(prob_schedules), last_day - first_day + 1))
+    for t, (cdf, doy) in enumerate(zip(cdfs, doys)):
+        np.add.at(day_mass[t], doy - first_day, np.diff(cdf, prepend=0.0))
+        day_mass[t] /= day_mass[t].sum()
+    return first_day, last_day, day_mass
+
+
+def _build_cell_tables(
+    day_mass: np.ndarray, shift: np.ndarray, first_day: int, last_day: int
+) -> tuple:
+    """
+    Cell tables for storms whose i-th arrival has daily density day_mass[i]
+    and is shifted by shift[i]; R[0, 0] is the total weight (0 if infeasible).
+    """
+    n = shift.size
+    t0 = float(first_day)
+    t1 = float(last_day + 1)
+
+    # cell edges: every day boundary seen from every shifted storm
+    days = np.arange(first_day, last_day + 2, dtype=float)
+    edges = (days[None, :] - shift[:, None]).ravel()
+    edges = edges[(edges > t0) & (edges < t1)]
+    edges = np.unique(np.round(np.concatenate([[t0, t1], edges]), 9))
+
+    lo = edges[:-1]
+    width = np.diff(edges)
+    mid = lo + width / 2.0
+    n_cells = width.size
+
+    # day and density of storm i when its y lies in cell c
+    day = np.floor(mid[None, :] + shift[:, None]).astype(int)
+    inside = day <= last_day
+    phi = np.where(
+        inside,
+        np.take_along_axis(
+            day_mass, np.clip(day - first_day, 0, day_mass.shape[1] - 1), axis=1
+        ),
+        0.0,
+    )
+
+    # A[c, k, m]: weight of storms k..k+m-1 all in cell c (sorted in-cell)
+    A = np.zeros((n_cells, n + 1, n + 1))
+    A[:, :, 0] = 1.0
+    for m in range(1, n + 1):
+        kmax = n - m + 1
+        A[:, :kmax, m] = (
+            A[:, :kmax, m - 1] * phi[m - 1 : m - 1 + kmax].T * width[:, None]
+        ) * (factorial(m - 1) / factorial(m))
+
+    # backward pass: R[c, k] = sum_m A[c, k, m] R[c + 1, k + m]
+    K, M = np.meshgrid(np.arange(n + 1), np.arange(n + 1), indexing="ij")
+    valid = K + M <= n
+    target = np.where(valid, K + M, n)
+
+    R = np.zeros((n_cells + 1, n + 1))
+    R[n_cells, n] = 1.0
+    m_w = np.zeros((n_cells, n + 1, n + 1))
+    for c in range(n_cells - 1, -1, -1):
+        w = np.where(valid, A[c] * R[c + 1][target], 0.0)
+        R[c] = w.sum(axis=1)
+        m_w[c] = w
+
+    # cumulative P(m | cell c is the next occupied one, k placed), m >= 1
+    occ = m_w[:, :, 1:]
+    tot = occ.sum(axis=2, keepdims=True)
+    m_cdf = np.divide(
+        np.cumsum(occ, axis=2), tot, out=np.ones_like(occ), where=tot > 0
+    )
+
+    return lo, width, day, R, m_cdf
+
+
+def _sample_cells(
+    tables: tuple,
+    shift: np.ndarray,
+    size: int,
+    rng: np.random.Generator,
+    u: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Forward sampling of 'size' rows from _build_cell_tables output, from
+    'rng' or from the pre-drawn uniforms 'u' (see SeparatedArrivalSampler.sample).
+    """
+    lo, width, day, R, m_cdf = tables
+    n_storms = shift.size
+    n_cells = width.size
+
+    # search keys: R[:, k] is non-increasing in c, so -R[:, k] is sorted
+    neg_R = -R
+
+    cell = np.empty((size, n_storms), dtype=np.int64)
+    rows = np.arange(size)
+    k = np.zeros(size, dtype=np.int64)  # storms placed so far
+    c0 = np.zeros(size, dtype=np.int64)  # first cell still free
+
+    for kk in range(n_storms):
+        active = rows[k == kk]
+        if active.size == 0:
+            continue
+
+        if u is None:
+            u_cell, u_count = rng.random(active.size), rng.random(active.size)
+        else:
+            u_cell, u_count = u[active, kk], u[active, n_storms + kk]
+
+        # next occupied cell c >= c0, P(c) ∝ R[c, kk] - R[c + 1, kk]
+        x = R[c0[active], kk] * u_cell
+        c = np.searchsorted(neg_R[:, kk], -x, side="left") - 1
+        np.clip(c, 0, n_cells - 1, out=c)
+
+        # number of storms sharing that cell
+        m = 1 + np.sum(m_cdf[c, kk] < u_count[:, None], axis=1)
+        np.minimum(m, n_storms - kk, out=m)
+
+        for j in range(int(m.max())):
+            sel = m > j
+            cell[active[sel], kk + j] = c[sel]
+
+        k[active] = kk + m
+        c0[active] = c + 1
+
+    # positions within cells; sorting keeps cell order since cells are disjoint
+    u_pos = rng.random((size, n_storms)) if u is None else u[:, 2 * n_storms :]
+    y = np.sort(lo[cell] + u_pos * width[cell], axis=1)
+    doy = day[np.arange(n_storms), cell]
+    hour = (y + shift - doy) * 24.0
+    np.clip(hour, 0.0, HOUR_MAX, out=hour)
+
+    return doy, hour
@@ -0,0 +1,58 @@
+# conversion/lifecycle-generation/lcgen/checkpoint.py
+import os
+import pickle
+from pathlib import Path
+from typing import Optional
+
+# Checkpoints of a batched lifecycle run (main.py). After a batch whose output
+# is durable, the run state needed to continue — next lifecycle, RNG state,
+# writer position, streaming accumulators — is pickled next to the output.
+# A restarted run with the same configuration loads it, rewinds the writer
+# to that position and continues, so the output matches an uninterrupted run.
+
+
+class RunCheckpoint:
+    """
+    One checkpoint file, tied to the run configuration it was written for.
+
+    'config' is any picklable, comparable description of the run (inputs,
+    rates, seeds, batch size); a checkpoint written for another config is
+    refused rather than silently mixed into different output.
+    """
+
+    def __init__(self, path, config: dict):
+        self.path = Path(path)
+        self.config = config
+
+    def load(self) -> Optional[dict]:
+        """
+        Saved run state, or None when there is nothing to resume.
+        """
+        if not self.path.exists():
+            return None
+        with open(self.path, "rb") as f:
+            saved = pickle.load(f)
+        if saved["config"] != self.config:
+            raise ValueError(
+                f"checkpoint {self.path} was written for a different configuration;"
+                " delete it to start over"
+            )
+        return saved["state"]
+
+    def save(self, state: dict) -> None:
+        """
+        Atomically replace the checkpoint with 'state'.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump({"config": self.config, "state": state}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def clear(self) -> None:
+        """
+        Remove the checkpoint once the run has completed.
+        """
+        self.path.unlink(missing_ok=True)
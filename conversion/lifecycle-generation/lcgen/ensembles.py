@@ -0,0 +1,95 @@
+# conversion/lifecycle-generation/lcgen/ensembles.py
+import warnings
+from typing import Optional
+
+import numpy as np
+from scipy import stats
+from scipy.stats import qmc
+
+# Variance-reduced lifecycle ensembles.
+#
+# Every simulated year (lifecycle-major: year i of lifecycle k is row
+# k * duration_years + i) is one point of a (1 + storm_dims)-dimensional
+# unit cube: coordinate 0 drives the Poisson storm count by inversion,
+# coordinates 1..storm_dims drive the storm IDs of the year's first
+# storm_dims events (lcgen.samplers.EventSampler.storms_from_uniforms).
+# Arrival dates and hours, and storms beyond storm_dims, stay pseudo-random.
+#
+#   "mc"         : independent uniforms (plain Monte Carlo)
+#   "antithetic" : lifecycle 2j + 1 reuses 1 - u of lifecycle 2j
+#   "sobol"      : one scrambled Sobol' sequence over all years of the ensemble
+
+ENSEMBLE_SCHEMES = ("mc", "antithetic", "sobol")
+
+
+class YearUniforms:
+    """
+    Source of the per-year uniforms of a whole lifecycle ensemble.
+
+    draw() is random access by lifecycle range, so batches may be drawn in
+    any order and reproduce the same points; keep one instance per ensemble.
+    """
+
+    def __init__(
+        self,
+        scheme: str,
+        duration_years: int,
+        storm_dims: int = 8,
+        seed: Optional[int] = None,
+    ):
+        if scheme not in ENSEMBLE_SCHEMES:
+            raise ValueError(f"scheme must be one of {ENSEMBLE_SCHEMES}, got {scheme!r}")
+        self.scheme = scheme
+        self.duration_years = duration_years
+        self.storm_dims = storm_dims
+        self._sobol = None
+        if scheme == "sobol":
+            self._sobol = qmc.Sobol(1 + storm_dims, scramble=True, seed=seed)
+
+    @property
+    def dims(self) -> int:
+        return 1 + self.storm_dims
+
+    def draw(
+        self, lifecycle_start: int, n_lifecycles: int, rng: np.random.Generator
+    ) -> np.ndarray:
+        """
+        Uniforms for lifecycles [lifecycle_start, lifecycle_start + n_lifecycles).
+
+        Returns
+        -------
+        np.ndarray : (n_lifecycles * duration_years, dims), rows ordered by
+                     lifecycle then year
+        """
+        n_years = n_lifecycles * self.duration_years
+
+        if self.scheme == "sobol":
+            self._sobol.reset()
+            if lifecycle_start:
+                self._sobol.fast_forward(lifecycle_start * self.duration_years)
+            with warnings.catch_warnings():
+                # balance holds over the whole ensemble, not each batch
+                warnings.simplefilter("ignore", UserWarning)
+                return self._sobol.random(n_years)
+
+        if self.scheme == "antithetic":
+            if lifecycle_start % 2:
+                raise ValueError("antithetic batches must start at an even lifecycle")
+            n_pairs, odd = divmod(n_lifecycles, 2)
+            u = rng.random((n_pairs, 2, self.duration_years, self.dims))
+            u[:, 1] = 1.0 - u[:, 0]
+            u = u.reshape(-1, self.dims)
+            if odd:
+                # trailing unpaired lifecycle is plain Monte Carlo
+                u = np.vstack([u, rng.random((self.duration_years, self.dims))])
+            return u
+
+        return rng.random((n_years, self.dims))
+
+
+def poisson_counts(lam: float, u: np.ndarray) -> np.ndarray:
+    """
+    N ~ Poisson(lam) by inversion, monotone in u.
+    """
+    u = np.clip(u, 0.0, np.nextafter(1.0, 0.0))
+    return np.maximum(stats.poisson.ppf(u, lam), 0).astype(np.int64)
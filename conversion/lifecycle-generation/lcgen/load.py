@@ -1,21 +1,83 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
 import pandas as pd
 import numpy as np
 
+# Binary cache: cached_arrays stores what a reader parsed from a source file
+# as one .npy file per named array in
+#   <cache_dir>/<source stem>-<key>/
+# where key hashes the source bytes, the reader and its arguments; a changed
+# source gets a new key, so stale entries are never read. Arrays are stored
+# column-major and memory-mapped read-only, so every column is one contiguous
+# block and repeated runs and forked workers share pages. Object arrays (MAT
+# structs) are pickled and loaded into memory instead.
+# load_relative_probabilities / load_storm_id_cdf with a 'cache_dir' cache
+# their frame this way, as does setup_SRR_DSW.py for parsed MAT variables.
+CACHE_VERSION = 2
+
 
-def load_relative_probabilities(filepath: str):
+def load_relative_probabilities(
+    filepath: str,
+    cdf_column: str = "Cumulative trop prob",
+    cache_dir: Optional[str] = None,
+):
     """
     Load daily cumulative storm probabilities by (Month, Day).
-    Expects columns: 'Month', 'Day', 'Cumulative trop prob'.
+    Expects columns: 'Month', 'Day' and 'cdf_column' (e.g.
+    'Cumulative extra prob' for an extratropical schedule), which is
+    returned as 'trop_day_cdf' whatever the storm family.
+
+    With 'cache_dir', the parsed schedule is cached as memory-mapped arrays.
     """
+    if cache_dir is not None:
+        return _cached(_read_relative_probabilities, filepath, cache_dir, cdf_column)
+    return _read_relative_probabilities(filepath, cdf_column)
+
+
+def load_storm_id_cdf(filepath: str, cache_dir: Optional[str] = None):
+    """
+    Load storm IDs, central pressure deficits and their probabilities from
+    CHS master track.
+    Expects columns: 'storm_ID', 'DSW' and, for importance sampling, 'dP'.
+
+    With 'cache_dir', the sorted catalog and its CDF are cached as
+    memory-mapped arrays.
+    """
+    if cache_dir is not None:
+        return _cached(_read_storm_id_cdf, filepath, cache_dir)
+    return _read_storm_id_cdf(filepath)
+
+
+def load_intensity_buckets(filepath: str):
+    """
+    Load per-save-point intensity bucket rates and members written by
+    setup_SRR_DSW.py.
+    Expects columns: 'bucket', 'rate' (storms/year), 'storm_ID', one row
+    per member storm, and optionally 'save_point' for multi-site tables.
+    A row with an empty 'storm_ID' records the rate of a bucket without
+    member storms.
+    """
+    dtype = {"save_point": int, "bucket": str, "rate": float, "storm_ID": "Int64"}
+    return pd.read_csv(
+        filepath, usecols=lambda c: c in dtype, dtype=dtype
+    ).rename(columns={"storm_ID": "storm_id"})
+
+
+def _read_relative_probabilities(filepath: str, cdf_column: str):
     df = pd.read_csv(
         filepath,
-        usecols=["Month", "Day", "Cumulative trop prob"],
-        dtype={"Month": int, "Day": int, "Cumulative trop prob": float},
+        usecols=["Month", "Day", cdf_column],
+        dtype={"Month": int, "Day": int, cdf_column: float},
     ).rename(
         columns={
             "Month": "month",
             "Day": "day",
-            "Cumulative trop prob": "trop_day_cdf",
+            cdf_column: "trop_day_cdf",
         }
     )
     df["day_of_year"] = pd.to_datetime(
@@ -24,16 +86,17 @@ def load_relative_probabilities(filepath: str):
     return df
 
 
-def load_storm_id_cdf(filepath: str):
-    """
-    Load storm IDs and their probabilities from CHS master track.
-    Expects columns: 'storm_ID', 'DSW' (or similar).
-    """
-    df = pd.read_csv(
-        filepath, usecols=["storm_ID", "DSW"], dtype={"storm_ID": int, "DSW": float}
-    ).rename(
+def _read_storm_id_cdf(filepath: str):
+    # dP is only needed for importance sampling; catalogs without it still load
+    dtype = {"storm_ID": int, "dP": float, "DSW": float}
+    df = pd.read_csv(filepath, usecols=lambda c: c in dtype, dtype=dtype)
+    missing = {"storm_ID", "DSW"}.difference(df.columns)
+    if missing:
+        raise ValueError(f"{filepath} is missing columns {sorted(missing)}")
+    df = df.rename(
         columns={
             "storm_ID": "storm_id",
+            "dP": "dp",
             "DSW": "dsw",
         }
     )
@@ -43,3 +106,69 @@ def load_storm_id_cdf(filepath: str):
     df["prob"] = df["dsw"] / total_weight
     df["cdf"] = np.cumsum(df["prob"])
     return df
+
+
+def cached_arrays(reader, filepath, cache_dir, *args) -> dict[str, np.ndarray]:
+    """
+    reader(filepath, *args) through the binary cache in 'cache_dir'. The
+    reader returns named columns or arrays: a DataFrame or a dict of arrays.
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        Arrays in reader order, memory-mapped unless they hold objects.
+    """
+    source = Path(filepath)
+    digest = hashlib.sha256(
+        json.dumps([CACHE_VERSION, reader.__name__, args, file_digest(source)]).encode()
+    )
+    entry = Path(cache_dir) / f"{source.stem}-{digest.hexdigest()[:16]}"
+
+    if not (entry / "names.json").exists():
+        parsed = reader(filepath, *args)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        # write next to the entry, then rename, so readers never see a partial one
+        tmp = Path(tempfile.mkdtemp(dir=entry.parent, prefix=f".{entry.name}-"))
+        names = []
+        for i, (name, arr) in enumerate(parsed.items()):
+            names.append(name)
+            arr = np.asarray(arr)
+            if arr.dtype != object:
+                arr = np.asfortranarray(arr)
+            np.save(tmp / f"{i}.npy", arr, allow_pickle=arr.dtype == object)
+        (tmp / "names.json").write_text(json.dumps(names))
+        try:
+            os.replace(tmp, entry)
+        except OSError:
+            # another process cached the same source first
+            for file in tmp.iterdir():
+                file.unlink()
+            tmp.rmdir()
+
+    arrays = {}
+    for i, name in enumerate(json.loads((entry / "names.json").read_text())):
+        try:
+            arrays[name] = np.load(entry / f"{i}.npy", mmap_mode="r")
+        except ValueError:
+            # object array: not memory-mappable
+            arrays[name] = np.load(entry / f"{i}.npy", allow_pickle=True)
+    return arrays
+
+
+def file_digest(filepath) -> str:
+    """
+    SHA-256 hex digest of a file's contents, read in blocks.
+    """
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(1 << 24), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cached(reader, filepath: str, cache_dir: str, *args) -> pd.DataFrame:
+    """
+    reader(filepath, *args), a DataFrame, through the binary cache in
+    'cache_dir'.
+    """
+    return pd.DataFrame(cached_arrays(reader, filepath, cache_dir, *args), copy=False)
@@ -0,0 +1,252 @@
+# conversion/lifecycle-generation/lcgen/output.py
+import re
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+import lcgen
+
+# Streaming sinks for lifecycle batches. Batches must arrive in ascending,
+# non-overlapping lifecycle order (as produced by main.py).
+#
+# Both sinks can be checkpointed between batches (see lcgen.checkpoint):
+# checkpoint(next_lifecycle) returns the position to pass back as 'resume'
+# on restart, or None when the output is not durable at that point.
+#
+# Multi-save-point runs write one such sink per site under
+#   <directory>/sp_<save_point>/
+#
+# Parquet layout: one file per fixed lifecycle range,
+#   <directory>/lc_<first>-<last>.parquet
+# with one row group per written batch, so readers prune by file name and
+# row-group statistics on 'lifecycle'.
+
+PARTITION_PATTERN = re.compile(r"lc_(\d+)-(\d+)\.parquet$")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as err:
+        raise ImportError(
+            "Parquet output needs pyarrow (pip install 'conversion[parquet]')"
+        ) from err
+    return pyarrow, pyarrow.parquet
+
+
+class CsvEventWriter:
+    """
+    Append lifecycle batches to a single EventDate_LC CSV.
+
+    With 'resume', the file is truncated back to that checkpoint and
+    appended to; otherwise it is replaced.
+    """
+
+    def __init__(self, path, resume: Optional[dict] = None):
+        self.path = Path(path)
+        self._header = True
+        if resume is not None and resume["size"] > 0:
+            with open(self.path, "r+b") as f:
+                f.truncate(resume["size"])
+            self._header = False
+
+    def write(self, events: lcgen.results.LifecycleEvents) -> None:
+        events.to_frame().to_csv(
+            self.path, mode="w" if self._header else "a", header=self._header, index=False
+        )
+        self._header = False
+
+    def close(self) -> None:
+        if self._header:
+            # nothing written: still leave a header-only file behind
+            pd.DataFrame(columns=lcgen.results.OUTPUT_COLUMNS).to_csv(
+                self.path, index=False
+            )
+            self._header = False
+
+    def checkpoint(self, next_lifecycle: int) -> dict:
+        # every write() reopens and closes the file, so any batch boundary is durable
+        return {"size": 0 if self._header else self.path.stat().st_size}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ParquetEventWriter:
+    """
+    Stream lifecycle batches into a lifecycle-partitioned Parquet dataset.
+
+    Lifecycle k goes to the file covering
+    [k // lifecycles_per_file * lifecycles_per_file, ... + lifecycles_per_file);
+    each file is closed as soon as a later range starts, so memory holds at
+    most one batch. Partition files already in 'directory' are replaced,
+    except, with 'resume', the complete files before the checkpoint.
+    """
+
+    def __init__(
+        self,
+        directory,
+        lifecycles_per_file: int = 1000,
+        compression: str = "zstd",
+        resume: Optional[dict] = None,
+    ):
+        self.pa, self.pq = _require_pyarrow()
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        keep_before = 0 if resume is None else resume["next_lifecycle"]
+        for stale in self.directory.glob("lc_*.parquet"):
+            if int(PARTITION_PATTERN.search(stale.name).group(1)) >= keep_before:
+                stale.unlink()
+        self.lifecycles_per_file = lifecycles_per_file
+        self.compression = compression
+
+        self._writer = None
+        self._partition: Optional[int] = None
+
+    def write(self, events: lcgen.results.LifecycleEvents) -> None:
+        if len(events) == 0:
+            return
+        partition = events.lifecycle // self.lifecycles_per_file
+        # rows are ordered by lifecycle, so each partition is one slice
+        bounds = np.flatnonzero(np.diff(partition)) + 1
+        for lo, hi in zip(np.r_[0, bounds], np.r_[bounds, len(events)]):
+            self._write_partition(int(partition[lo]), events.select(slice(lo, hi)))
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def checkpoint(self, next_lifecycle: int) -> Optional[dict]:
+        # an open file has no footer yet: only file boundaries are durable
+        if next_lifecycle % self.lifecycles_per_file:
+            return None
+        self.close()
+        return {"next_lifecycle": next_lifecycle}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write_partition(self, partition: int, events) -> None:
+        if partition != self._partition:
+            if self._partition is not None and partition < self._partition:
+                raise ValueError("lifecycle batches must be written in ascending order")
+            self.close()
+            first = partition * self.lifecycles_per_file
+            last = first + self.lifecycles_per_file - 1
+            path = self.directory / f"lc_{first:07d}-{last:07d}.parquet"
+            self._writer = self.pq.ParquetWriter(
+                path,
+                _schema(self.pa, events.init_year, events.optional_columns),
+                compression=self.compression,
+            )
+            self._partition = partition
+
+        table = self.pa.Table.from_pandas(
+            _typed_frame(events), schema=self._writer.schema, preserve_index=False
+        )
+        self._writer.write_table(table)
+
+
+def event_writer(directory, output_format: str = "csv", resume: Optional[dict] = None):
+    """
+    EventDate_LC sink in 'directory': EventDate_LC.csv for "csv", the
+    EventDate_LC/ dataset for "parquet".
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    if output_format == "parquet":
+        return ParquetEventWriter(directory / "EventDate_LC", resume=resume)
+    if output_format == "csv":
+        return CsvEventWriter(directory / "EventDate_LC.csv", resume=resume)
+    raise ValueError(f"unknown output_format '{output_format}', expected 'csv' or 'parquet'")
+
+
+def save_point_directory(directory, save_point: int) -> Path:
+    """
+    Output partition of one save point in a multi-save-point run.
+    """
+    return Path(directory) / f"sp_{save_point}"
+
+
+def read_events(
+    path,
+    lifecycle_start: Optional[int] = None,
+    lifecycle_stop: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Read lifecycles [lifecycle_start, lifecycle_stop) from an EventDate_LC
+    CSV or a Parquet dataset directory written by ParquetEventWriter.
+
+    For Parquet only the overlapping files and row groups are read.
+    """
+    path = Path(path)
+    lo = 0 if lifecycle_start is None else lifecycle_start
+    hi = np.iinfo(np.int32).max if lifecycle_stop is None else lifecycle_stop
+
+    if not path.is_dir():
+        df = pd.read_csv(path)
+        return df[(df["lifecycle"] >= lo) & (df["lifecycle"] < hi)].reset_index(drop=True)
+
+    _, pq = _require_pyarrow()
+    tables = []
+    for file in sorted(path.glob("lc_*.parquet")):
+        first, last = map(int, PARTITION_PATTERN.search(file.name).groups())
+        if last < lo or first >= hi:
+            continue
+        tables.append(
+            pq.read_table(
+                file, filters=[("lifecycle", ">=", lo), ("lifecycle", "<", hi)]
+            ).to_pandas()
+        )
+    if not tables:
+        return pd.DataFrame(columns=lcgen.results.OUTPUT_COLUMNS)
+    return pd.concat(tables, ignore_index=True)
+
+
+def iter_event_frames(path, chunk_rows: int = 1_000_000) -> Iterator[pd.DataFrame]:
+    """
+    Stream an EventDate_LC CSV (in chunks of chunk_rows) or Parquet dataset
+    (file by file) in lifecycle order without loading it whole. CSV floats
+    are parsed exactly, so rewriting a frame reproduces its source text.
+    """
+    path = Path(path)
+    if not path.is_dir():
+        yield from pd.read_csv(path, chunksize=chunk_rows, float_precision="round_trip")
+        return
+    _, pq = _require_pyarrow()
+    for file in sorted(path.glob("lc_*.parquet")):
+        yield pq.read_table(file).to_pandas()
+
+
+def _typed_frame(events: lcgen.results.LifecycleEvents) -> pd.DataFrame:
+    df = events.to_frame()
+    df["year"] = df["year"].astype(np.int16)
+    df["month"] = df["month"].astype(np.int8)
+    df["day"] = df["day"].astype(np.int8)
+    return df
+
+
+def _schema(pa, init_year: int, optional=()):
+    fields = [
+        ("lifecycle", pa.int32()),
+        ("year_offset", pa.int16()),
+        ("year", pa.int16()),
+        ("month", pa.int8()),
+        ("day", pa.int8()),
+        ("hour", pa.float32()),
+        ("event_start", pa.int64()),
+        ("storm_id", pa.int32()),
+    ]
+    optional_types = {"weight": pa.float64(), "storm_type": pa.int8()}
+    fields += [(name, optional_types[name]) for name in optional]
+    return pa.schema(fields, metadata={"init_year": str(init_year)})
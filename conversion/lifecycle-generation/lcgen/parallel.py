@@ -0,0 +1,265 @@
+# conversion/lifecycle-generation/lcgen/parallel.py
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator, Optional, Sequence
+
+import pandas as pd
+
+import lcgen
+
+# lifecycle_pool → one ProcessPoolExecutor, reused by every batch of a run
+# simulate_lifecycles_parallel → _simulate_range (per worker) → lcgen.streams.regenerate_lifecycles
+# simulate_save_points → _simulate_save_point (per worker) → _save_point_inputs → lcgen.streams.regenerate_lifecycles
+
+# Shared read-only inputs, set once per worker process by _init_worker
+_WORKER_INPUTS: dict = {}
+
+# save points whose storm set and sampler a worker keeps; tasks arrive in
+# save point order, so a worker only ever needs the last few
+SAVE_POINT_CACHE_SIZE = 4
+
+
+def lifecycle_pool(
+    prob_schedule: pd.DataFrame,
+    storm_set: pd.DataFrame,
+    workers: Optional[int] = None,
+) -> ProcessPoolExecutor:
+    """
+    Process pool whose workers hold the schedule and catalog, to pass as
+    'pool' to every simulate_lifecycles_parallel batch of a run with these
+    inputs. Shut it down (or use it as a context manager) when done.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(prob_schedule, storm_set),
+    )
+
+
+def simulate_lifecycles_parallel(
+    n_lifecycles: int,
+    init_year: int,
+    duration_years: int,
+    lam: float,
+    min_sep_days: float,
+    prob_schedule: pd.DataFrame,
+    storm_set: pd.DataFrame,
+    seed: int,
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+    lifecycle_start: int = 0,
+    bit_generator: str = "philox",
+    pool: Optional[ProcessPoolExecutor] = None,
+) -> lcgen.results.LifecycleEvents:
+    """
+    Simulate lifecycles over a process pool.
+
+    Lifecycle k draws from its own stream
+    lcgen.streams.lifecycle_rng(seed, k, bit_generator), so the output is
+    bit-identical for any 'workers' or 'chunk_size', and any lifecycle can be
+    rebuilt alone with lcgen.streams.regenerate_lifecycles. Each task runs
+    the vectorized engine over its range of streams.
+
+    Pass a lifecycle_pool built for the same prob_schedule and storm_set to
+    reuse one pool across batches; otherwise a pool is started for this
+    call, and workers=1 runs in-process without one.
+    """
+    stop = lifecycle_start + n_lifecycles
+    ranges = [
+        (start, min(start + chunk_size, stop))
+        for start in range(lifecycle_start, stop, chunk_size)
+    ]
+    params = dict(
+        init_year=init_year,
+        duration_years=duration_years,
+        lam=lam,
+        min_sep_days=min_sep_days,
+        seed=seed,
+        bit_generator=bit_generator,
+    )
+
+    if pool is not None:
+        parts = _run_ranges(pool, ranges, params)
+    elif workers == 1:
+        _init_worker(prob_schedule, storm_set)
+        parts = [_simulate_range(start, stop, **params) for start, stop in ranges]
+    else:
+        with lifecycle_pool(prob_schedule, storm_set, workers) as pool:
+            parts = _run_ranges(pool, ranges, params)
+
+    return lcgen.results.LifecycleEvents.concat(parts)
+
+
+def _run_ranges(
+    pool: ProcessPoolExecutor, ranges: list, params: dict
+) -> list[lcgen.results.LifecycleEvents]:
+    futures = [
+        pool.submit(_simulate_range, start, stop, **params) for start, stop in ranges
+    ]
+    # collect in submission order so output is ordered by lifecycle
+    return [f.result() for f in futures]
+
+
+@dataclass
+class SavePoint:
+    """
+    One site of a multi-save-point job: its id and its intensity bucket
+    rows (lcgen.load.load_intensity_buckets format), which set the rate and
+    the storm subset drawn from the shared catalog.
+    """
+
+    save_point: int
+    buckets: pd.DataFrame
+
+
+def save_points_from_buckets(buckets: pd.DataFrame) -> list[SavePoint]:
+    """
+    Split a multi-site intensity bucket table (with 'save_point') by site.
+    """
+    return [
+        SavePoint(int(sp), rows.drop(columns="save_point").reset_index(drop=True))
+        for sp, rows in buckets.groupby("save_point", sort=True)
+    ]
+
+
+def simulate_save_points(
+    save_points: Sequence[SavePoint],
+    n_lifecycles: int,
+    init_year: int,
+    duration_years: int,
+    min_sep_days: float,
+    prob_schedule: pd.DataFrame,
+    storm_set: pd.DataFrame,
+    seed: int,
+    workers: Optional[int] = None,
+    lcs_per_batch: int = 1000,
+    bit_generator: str = "philox",
+) -> Iterator[tuple[SavePoint, lcgen.results.LifecycleEvents]]:
+    """
+    Simulate n_lifecycles for every save point over one process pool.
+
+    The schedule and catalog are shipped to each worker once, and each
+    worker builds a save point's storm set and sampler once; a task is one
+    batch of up to lcs_per_batch lifecycles of one save point, run by the
+    vectorized engine. Lifecycle k of a save point draws from
+    lcgen.streams.lifecycle_rng(lcgen.streams.save_point_seed(seed, sp), k),
+    so output does not depend on 'workers', 'lcs_per_batch' or the order of
+    save_points, and regenerate_lifecycles can rebuild any lifecycle.
+
+    Yields (save point, events) in save point then lifecycle order, keeping
+    at most a few batches per worker in flight. workers=1 runs in-process.
+    """
+    tasks = [
+        (sp, start, min(start + lcs_per_batch, n_lifecycles))
+        for sp in save_points
+        for start in range(0, n_lifecycles, lcs_per_batch)
+    ]
+    params = dict(
+        init_year=init_year,
+        duration_years=duration_years,
+        min_sep_days=min_sep_days,
+        seed=seed,
+        bit_generator=bit_generator,
+    )
+
+    if workers == 1:
+        _init_worker(prob_schedule, storm_set)
+        for sp, start, stop in tasks:
+            yield sp, _simulate_save_point(sp, start, stop, **params)
+        return
+
+    window = 2 * (workers or os.cpu_count() or 1)
+    with lifecycle_pool(prob_schedule, storm_set, workers) as pool:
+        pending: deque = deque()
+        for sp, start, stop in tasks:
+            pending.append((sp, pool.submit(_simulate_save_point, sp, start, stop, **params)))
+            if len(pending) >= window:
+                sp_done, future = pending.popleft()
+                yield sp_done, future.result()
+        while pending:
+            sp_done, future = pending.popleft()
+            yield sp_done, future.result()
+
+
+def _init_worker(prob_schedule: pd.DataFrame, storm_set: pd.DataFrame) -> None:
+    _WORKER_INPUTS["prob_schedule"] = prob_schedule
+    _WORKER_INPUTS["storm_set"] = storm_set
+    _WORKER_INPUTS["sampler"] = lcgen.samplers.EventSampler(prob_schedule, storm_set)
+    _WORKER_INPUTS["save_points"] = {}
+
+
+def _simulate_range(
+    start: int,
+    stop: int,
+    init_year: int,
+    duration_years: int,
+    lam: float,
+    min_sep_days: float,
+    seed: int,
+    bit_generator: str,
+) -> lcgen.results.LifecycleEvents:
+    """
+    Simulate lifecycles [start, stop), each from its own child generator.
+    """
+    return lcgen.streams.regenerate_lifecycles(
+        seed=seed,
+        lifecycle_start=start,
+        lifecycle_stop=stop,
+        init_year=init_year,
+        duration_years=duration_years,
+        lam=lam,
+        min_sep_days=min_sep_days,
+        prob_schedule=_WORKER_INPUTS["prob_schedule"],
+        storm_set=_WORKER_INPUTS["storm_set"],
+        bit_generator=bit_generator,
+        sampler=_WORKER_INPUTS["sampler"],
+    )
+
+
+def _simulate_save_point(
+    save_point: SavePoint,
+    start: int,
+    stop: int,
+    init_year: int,
+    duration_years: int,
+    min_sep_days: float,
+    seed: int,
+    bit_generator: str,
+) -> lcgen.results.LifecycleEvents:
+    """
+    Simulate lifecycles [start, stop) of one save point, each from its own
+    stream under the save point's seed.
+    """
+    lam, storm_set, sampler = _save_point_inputs(save_point)
+    return lcgen.streams.regenerate_lifecycles(
+        seed=lcgen.streams.save_point_seed(seed, save_point.save_point),
+        lifecycle_start=start,
+        lifecycle_stop=stop,
+        init_year=init_year,
+        duration_years=duration_years,
+        lam=lam,
+        min_sep_days=min_sep_days,
+        prob_schedule=_WORKER_INPUTS["prob_schedule"],
+        storm_set=storm_set,
+        bit_generator=bit_generator,
+        sampler=sampler,
+    )
+
+
+def _save_point_inputs(save_point: SavePoint) -> tuple:
+    """
+    Rate, storm set and EventSampler of a save point, built on its first
+    batch in this worker and reused by the following ones.
+    """
+    cache = _WORKER_INPUTS["save_points"]
+    if save_point.save_point not in cache:
+        if len(cache) >= SAVE_POINT_CACHE_SIZE:
+            del cache[next(iter(cache))]
+        lam, storm_set = lcgen.samplers.intensity_storm_set(
+            _WORKER_INPUTS["storm_set"], save_point.buckets
+        )
+        sampler = lcgen.samplers.EventSampler(_WORKER_INPUTS["prob_schedule"], storm_set)
+        cache[save_point.save_point] = (lam, storm_set, sampler)
+    return cache[save_point.save_point]
@@ -0,0 +1,217 @@
+# conversion/lifecycle-generation/lcgen/results.py
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+import lcgen
+
+# Stored column dtypes; year / month / day / event_start are derived on demand.
+EVENT_DTYPES = {
+    "lifecycle": np.int32,
+    "year_offset": np.int16,
+    "day_of_year": np.int16,
+    "hour": np.float32,
+    "storm_id": np.int32,
+}
+
+# Columns written to EventDate_LC outputs
+OUTPUT_COLUMNS = [
+    "lifecycle",
+    "year_offset",
+    "year",
+    "month",
+    "day",
+    "hour",
+    "event_start",
+    "storm_id",
+]
+
+# Optional columns, written after OUTPUT_COLUMNS when present:
+#   weight     : likelihood ratio of importance-sampled runs
+#   storm_type : storm family index of joint runs (0 tropical, 1 extratropical)
+OPTIONAL_DTYPES = {
+    "weight": np.float64,
+    "storm_type": np.int8,
+}
+
+
+@dataclass
+class LifecycleEvents:
+    """
+    Struct-of-arrays lifecycle event table.
+
+    One typed column per field (see EVENT_DTYPES), all the same length,
+    ordered by lifecycle, then year, then time. init_year is shared by
+    every event.
+
+    Importance-sampled tables also carry 'weight', the likelihood ratio
+    p(storm) / q(storm) of each event, and joint multi-family tables carry
+    'storm_type'; both are None otherwise (see OPTIONAL_DTYPES).
+    """
+
+    init_year: int
+    lifecycle: np.ndarray
+    year_offset: np.ndarray
+    day_of_year: np.ndarray
+    hour: np.ndarray
+    storm_id: np.ndarray
+    weight: Optional[np.ndarray] = None
+    storm_type: Optional[np.ndarray] = None
+
+    def __post_init__(self):
+        for name, dtype in {**EVENT_DTYPES, **OPTIONAL_DTYPES}.items():
+            # no copy when the column already has the stored dtype
+            if getattr(self, name) is not None:
+                setattr(self, name, np.asarray(getattr(self, name), dtype=dtype))
+        n = self.lifecycle.shape[0]
+        for name in self._columns():
+            col = getattr(self, name)
+            if col.ndim != 1 or col.shape[0] != n:
+                raise ValueError(f"column '{name}' must be 1-D with {n} rows")
+
+    def __len__(self) -> int:
+        return self.lifecycle.shape[0]
+
+    @classmethod
+    def empty(
+        cls, init_year: int, size: int = 0, optional: Iterable[str] = ()
+    ) -> "LifecycleEvents":
+        """
+        Preallocate an (uninitialized) table of 'size' events, including the
+        named OPTIONAL_DTYPES columns.
+        """
+        return cls(
+            init_year,
+            **{name: np.empty(size, dtype=dtype) for name, dtype in EVENT_DTYPES.items()},
+            **{name: np.empty(size, dtype=OPTIONAL_DTYPES[name]) for name in optional},
+        )
+
+    @classmethod
+    def concat(cls, parts: Sequence["LifecycleEvents"]) -> "LifecycleEvents":
+        """
+        Merge tables into one, allocating each column exactly once.
+        """
+        parts = list(parts)
+        if not parts:
+            raise ValueError("need at least one LifecycleEvents to concat")
+        init_year = parts[0].init_year
+        if any(p.init_year != init_year for p in parts):
+            raise ValueError("cannot concat lifecycles with different init_year")
+        optional = parts[0].optional_columns
+        if any(p.optional_columns != optional for p in parts):
+            raise ValueError("cannot concat lifecycles with different optional columns")
+        if len(parts) == 1:
+            return parts[0]
+
+        out = cls.empty(init_year, sum(len(p) for p in parts), optional)
+        for name in out._columns():
+            np.concatenate([getattr(p, name) for p in parts], out=getattr(out, name))
+        return out
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, init_year: int) -> "LifecycleEvents":
+        """
+        Build from a simulate_lifecycle-style DataFrame.
+        """
+        optional = [name for name in OPTIONAL_DTYPES if name in df]
+        if df.empty:
+            return cls.empty(init_year, optional=optional)
+        return cls(
+            init_year, **{name: df[name].to_numpy() for name in list(EVENT_DTYPES) + optional}
+        )
+
+    @classmethod
+    def from_output_frame(cls, df: pd.DataFrame, init_year: int) -> "LifecycleEvents":
+        """
+        Build from an EventDate_LC output frame (lcgen.output.read_events),
+        recovering day_of_year from year / month / day.
+        """
+        optional = [name for name in OPTIONAL_DTYPES if name in df]
+        if df.empty:
+            return cls.empty(init_year, optional=optional)
+        doy = lcgen.utils.month_day_to_doy(
+            df["year"].to_numpy(), df["month"].to_numpy(), df["day"].to_numpy()
+        )
+        return cls(
+            init_year,
+            day_of_year=doy,
+            **{
+                name: df[name].to_numpy()
+                for name in list(EVENT_DTYPES) + optional
+                if name != "day_of_year"
+            },
+        )
+
+    @property
+    def weighted(self) -> bool:
+        return self.weight is not None
+
+    @property
+    def optional_columns(self) -> list[str]:
+        return [name for name in OPTIONAL_DTYPES if getattr(self, name) is not None]
+
+    @property
+    def output_columns(self) -> list[str]:
+        return OUTPUT_COLUMNS + self.optional_columns
+
+    @property
+    def year(self) -> np.ndarray:
+        return self.init_year + self.year_offset.astype(np.int32)
+
+    def month_day(self) -> tuple[np.ndarray, np.ndarray]:
+        return lcgen.utils.doy_to_month_day(self.year, self.day_of_year)
+
+    @property
+    def event_start(self) -> np.ndarray:
+        """
+        Event start as int64 seconds since 1970-01-01 (UTC).
+        """
+        return lcgen.utils.doy_to_datetime64(
+            self.year, self.day_of_year, self.hour
+        ).astype(np.int64)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self._columns())
+
+    def select(self, rows) -> "LifecycleEvents":
+        """
+        Subset by slice (a view, no copy) or by mask / index array.
+        """
+        return LifecycleEvents(
+            self.init_year, **{name: getattr(self, name)[rows] for name in self._columns()}
+        )
+
+    def lifecycle_bounds(self, start: int, stop: int) -> tuple[int, int]:
+        """
+        Row range [lo, hi) holding lifecycles [start, stop).
+        """
+        lo, hi = np.searchsorted(self.lifecycle, [start, stop], side="left")
+        return int(lo), int(hi)
+
+    def to_frame(self, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        DataFrame view of the requested columns (default .output_columns).
+        """
+        columns = self.output_columns if columns is None else list(columns)
+        data = {}
+        month = day = None
+        for name in columns:
+            if name in EVENT_DTYPES or name in self.optional_columns:
+                data[name] = getattr(self, name)
+            elif name == "year":
+                data[name] = self.year
+            elif name == "event_start":
+                data[name] = self.event_start
+            elif name in ("month", "day"):
+                if month is None:
+                    month, day = self.month_day()
+                data[name] = month if name == "month" else day
+            else:
+                raise KeyError(f"unknown lifecycle event column '{name}'")
+        return pd.DataFrame(data, copy=False)
+
+    def _columns(self) -> list[str]:
+        return list(EVENT_DTYPES) + self.optional_columns
@@ -0,0 +1,233 @@
+# conversion/lifecycle-generation/lcgen/samplers.py
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Importance-sampling buckets: central pressure deficit (dP, hPa) edges.
+# The default splits the SRR mid/high boundary (48) and the rare tail.
+IS_DP_EDGES = (48.0, 68.0, 78.0)
+
+
+class AliasTable:
+    """
+    Walker/Vose alias table over a discrete distribution.
+
+    Built once in O(n); each draw costs one uniform and one comparison,
+    independent of the number of categories.
+    """
+
+    def __init__(self, weights: np.ndarray):
+        w = np.asarray(weights, dtype=float)
+        if w.ndim != 1 or w.size == 0:
+            raise ValueError("weights must be a non-empty 1-D array")
+        if np.any(w < 0) or not np.isfinite(w).all() or w.sum() <= 0:
+            raise ValueError("weights must be finite, non-negative and not all zero")
+
+        n = w.size
+        scaled = w * (n / w.sum())
+        prob = np.ones(n)
+        alias = np.arange(n, dtype=np.int64)
+
+        small = [i for i in range(n) if scaled[i] < 1.0]
+        large = [i for i in range(n) if scaled[i] >= 1.0]
+        scaled = scaled.tolist()
+        while small and large:
+            s = small.pop()
+            l = large[-1]
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            if scaled[l] < 1.0:
+                small.append(large.pop())
+        # leftovers are 1 up to rounding
+        for i in small + large:
+            prob[i] = 1.0
+
+        self.prob = np.ascontiguousarray(prob)
+        self.alias = np.ascontiguousarray(alias)
+
+    def __len__(self) -> int:
+        return self.prob.size
+
+    def sample(self, size, rng: np.random.Generator) -> np.ndarray:
+        """
+        Draw category indices (int64) of the given size.
+        """
+        return self.lookup(rng.random(size))
+
+    def lookup(self, u: np.ndarray) -> np.ndarray:
+        """
+        Map uniforms in [0, 1) to category indices; one uniform per draw.
+        """
+        x = np.asarray(u) * len(self)
+        col = x.astype(np.int64)
+        np.minimum(col, len(self) - 1, out=col)
+        return np.where(x - col < self.prob[col], col, self.alias[col])
+
+
+class EventSampler:
+    """
+    Compiled day-of-year and storm-ID samplers.
+
+    Built once from lcgen.load.load_relative_probabilities and
+    lcgen.load.load_storm_id_cdf; holds the schedule and catalog as plain
+    contiguous arrays next to their alias tables.
+
+    If storm_set carries a 'proposal' column (see importance_storm_set),
+    storms are drawn from it instead of 'prob' and .storm_weight holds the
+    likelihood ratio prob / proposal of each catalog row; otherwise
+    .storm_weight is None.
+    """
+
+    def __init__(self, prob_schedule: pd.DataFrame, storm_set: pd.DataFrame):
+        day_cdf = prob_schedule["trop_day_cdf"].to_numpy(dtype=float)
+        self.day_of_year = np.ascontiguousarray(
+            prob_schedule["day_of_year"].to_numpy().astype(int)
+        )
+        self.day_table = AliasTable(np.diff(day_cdf, prepend=0.0))
+
+        self.storm_id = np.ascontiguousarray(storm_set["storm_id"].to_numpy())
+        self.storm_cdf = np.ascontiguousarray(storm_set["cdf"].to_numpy(dtype=float))
+        prob = storm_set["prob"].to_numpy(dtype=float)
+        self.storm_weight: Optional[np.ndarray] = None
+        if "proposal" in storm_set:
+            proposal = storm_set["proposal"].to_numpy(dtype=float)
+            if np.any((proposal <= 0) & (prob > 0)):
+                raise ValueError("proposal must be positive wherever prob is")
+            self.storm_table = AliasTable(proposal)
+            self.storm_weight = np.ascontiguousarray(
+                np.divide(prob, proposal, out=np.zeros_like(prob), where=proposal > 0)
+            )
+        else:
+            self.storm_table = AliasTable(prob)
+
+        # inversion order for storms_from_uniforms: by intensity when known
+        draw_prob = prob if self.storm_weight is None else proposal
+        self.storm_order = np.ascontiguousarray(
+            np.argsort(storm_set["dp"].to_numpy(), kind="stable")
+            if "dp" in storm_set
+            else np.arange(prob.size)
+        )
+        self.storm_order_cdf = np.cumsum(draw_prob[self.storm_order])
+        self.storm_order_cdf /= self.storm_order_cdf[-1]
+
+    @property
+    def weighted(self) -> bool:
+        return self.storm_weight is not None
+
+    def sample_days(self, size, rng: np.random.Generator) -> np.ndarray:
+        """
+        Draw days of year from the seasonal schedule.
+        """
+        return self.day_of_year[self.day_table.sample(size, rng)]
+
+    def sample_storms(self, size, rng: np.random.Generator) -> np.ndarray:
+        """
+        Draw catalog row indices; use .storm_id / .storm_cdf (and
+        .storm_weight when weighted) to resolve them.
+        """
+        return self.storm_table.sample(size, rng)
+
+    def storms_from_uniforms(self, u: np.ndarray) -> np.ndarray:
+        """
+        Catalog row indices by inverse CDF over storms ordered by dP, so the
+        map is monotone in intensity (for antithetic / quasi-random uniforms).
+        """
+        pos = np.searchsorted(self.storm_order_cdf, u, side="right")
+        np.minimum(pos, self.storm_order.size - 1, out=pos)
+        return self.storm_order[pos]
+
+
+def importance_storm_set(
+    storm_set: pd.DataFrame,
+    dp_edges: Sequence[float] = IS_DP_EDGES,
+    bucket_share: Optional[Sequence[float]] = None,
+) -> pd.DataFrame:
+    """
+    Add an importance-sampling proposal to a lcgen.load.load_storm_id_cdf
+    storm set.
+
+    Storms are bucketed by dP at 'dp_edges'; bucket b receives proposal mass
+    bucket_share[b] (default: equal shares over non-empty buckets), spread
+    within the bucket in proportion to 'prob'. The likelihood ratio
+    prob / proposal is therefore constant within a bucket, and rare high-dP
+    buckets are oversampled by share / natural mass.
+
+    Returns
+    -------
+    pd.DataFrame : copy of storm_set with 'dp_bucket' and 'proposal' columns
+    """
+    if "dp" not in storm_set:
+        raise ValueError(
+            "importance sampling buckets storms by dP; the storm set has no 'dp'"
+            " column (add 'dP' to the storm probability CSV)"
+        )
+    df = storm_set.copy()
+    prob = df["prob"].to_numpy(dtype=float)
+    bucket = np.digitize(df["dp"].to_numpy(dtype=float), np.asarray(dp_edges, dtype=float))
+    n_buckets = len(dp_edges) + 1
+    mass = np.bincount(bucket, weights=prob, minlength=n_buckets)
+
+    if bucket_share is None:
+        share = (mass > 0).astype(float)
+    else:
+        share = np.asarray(bucket_share, dtype=float)
+        if share.shape != (n_buckets,):
+            raise ValueError(f"bucket_share needs {n_buckets} entries (len(dp_edges) + 1)")
+        if np.any(share < 0) or np.any((share == 0) & (mass > 0)):
+            raise ValueError("bucket_share must be positive for every non-empty bucket")
+    share = share / share.sum()
+
+    scale = np.divide(share, mass, out=np.zeros(n_buckets), where=mass > 0)
+    df["dp_bucket"] = bucket
+    df["proposal"] = prob * scale[bucket]
+    return df
+
+
+def intensity_storm_set(
+    storm_set: pd.DataFrame, buckets: pd.DataFrame
+) -> Tuple[float, pd.DataFrame]:
+    """
+    Combine per-bucket storm rates with a lcgen.load.load_storm_id_cdf
+    storm set (buckets from lcgen.load.load_intensity_buckets).
+
+    Independent Poisson(rate_b) counts per bucket, with storms drawn within
+    bucket b in proportion to 'dsw', are one Poisson(sum of rates) count
+    whose storms come from the mixture rate_b / sum * dsw / dsw(bucket b).
+    That mixture is written to 'prob' / 'cdf', so every lifecycle engine
+    draws bucketed counts and storm IDs in its usual single pass. Rows
+    without a storm_id only carry their bucket's rate. A bucket with a
+    positive rate but no member storm weight raises ValueError rather than
+    losing its rate; zero-rate buckets (e.g. MI in NACCS) may be empty.
+
+    Returns
+    -------
+    lam       : float, total rate (storms/year)
+    storm_set : pd.DataFrame, member storms only, with a 'bucket' column
+    """
+    rates = buckets.groupby("bucket", sort=False)["rate"].first()
+    if rates.sum() <= 0:
+        raise ValueError("intensity bucket rates must not all be zero")
+    members = buckets.loc[buckets["storm_id"].notna(), ["bucket", "storm_id"]]
+    members = members.astype({"storm_id": np.int64})
+    if members["storm_id"].duplicated().any():
+        raise ValueError("a storm belongs to more than one intensity bucket")
+
+    df = storm_set.merge(members, on="storm_id", how="inner")
+    missing = np.setdiff1d(members["storm_id"].to_numpy(), df["storm_id"].to_numpy())
+    if missing.size:
+        raise ValueError(f"bucket members not in the storm set: {missing[:10].tolist()}")
+
+    bucket_dsw = df.groupby("bucket")["dsw"].sum().reindex(rates.index, fill_value=0.0)
+    empty = rates.index[(rates > 0) & (bucket_dsw <= 0)]
+    if len(empty):
+        raise ValueError(
+            f"buckets {list(empty)} have a rate but no member storms with weight"
+        )
+
+    scale = ((rates / rates.sum()) / bucket_dsw.where(bucket_dsw > 0)).fillna(0.0)
+    df["prob"] = df["dsw"] * df["bucket"].map(scale).to_numpy()
+    df = df.sort_values(by="prob").reset_index(drop=True)
+    df["cdf"] = np.cumsum(df["prob"])
+    return float(rates.sum()), df
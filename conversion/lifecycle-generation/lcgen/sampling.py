@@ -1,13 +1,24 @@
 # conversion/lifecycle-generation/lcgen/sampling.py
+import warnings
+
 import numpy as np
 import pandas as pd
-from typing import Tuple, Optional
+from dataclasses import dataclass
+from typing import Sequence, Tuple, Optional
 
 from tqdm.auto import tqdm
 
 import lcgen
 
-# simulate_lifecycle → _sample_year_events → (_sample_yearly_storm_count & _sample_layout_with_min_sep → _sample_day_of_year)
+# simulate_lifecycle → _sample_year → (_sample_storm_count_in_year & _arrival_sampler().sample)
+# simulate_lifecycles → (_sample_storm_counts & _sample_arrivals_batch) → flat event columns
+# simulate_lifecycle_streams → same, with counts and uniforms drawn per lifecycle generator
+#   with uniforms=lcgen.ensembles.YearUniforms: counts and storm IDs by inversion
+# simulate_joint_lifecycles → (_sample_storm_counts per family & _sample_joint_arrivals_batch)
+
+
+# events drawn per vectorized step in the batch engine; bounds temporaries
+BATCH_CHUNK_EVENTS = 1 << 20
 
 
 # -----------------------------
@@ -23,32 +34,35 @@ def simulate_lifecycle(
     storm_set: pd.DataFrame,
     show_progress: bool = False,
     rng: Optional[np.random.Generator] = None,
+    sampler: Optional[lcgen.samplers.EventSampler] = None,
 ) -> pd.DataFrame:
     """
     Simulate one lifecycle
+
+    Pass a prebuilt 'sampler' (lcgen.samplers.EventSampler) when simulating
+    many lifecycles against the same schedule and catalog. An importance
+    sampler (storm_set with a 'proposal' column) adds a 'weight' column.
     """
     if rng is None:
         rng = np.random.default_rng()
+    if sampler is None:
+        sampler = lcgen.samplers.EventSampler(prob_schedule, storm_set)
+    arrival_sampler = _arrival_sampler(prob_schedule, min_sep_days)
 
-    records: list[dict] = []
+    parts: list[tuple] = []
 
     year_iter = range(duration_years)
     if show_progress:
         year_iter = tqdm(year_iter, desc=f"LC {lifecycle_index}")
 
-    rand = rng.random
-
-    n_failed = 0
-
     for year_offset in year_iter:
-        year = init_year + year_offset
-
         # Sample all events for this year (count + layout handled internally)
-        doy, hour, failed = _sample_year(
+        doy, hour = _sample_year(
             lam=lam,
             prob_schedule=prob_schedule,
             min_sep_days=min_sep_days,
             rng=rng,
+            arrival_sampler=arrival_sampler,
         )
 
         n_kept = doy.size
@@ -56,27 +70,419 @@ def simulate_lifecycle(
             continue
 
         # populate Storm IDs
-        u_id = rand(n_kept)
-        idx_id = np.searchsorted(storm_set["cdf"], u_id, side="right")
-        sid = storm_set["storm_id"].to_numpy()[idx_id]
-        rcdf = storm_set["cdf"].to_numpy()[idx_id]
-        month, day = lcgen.utils.doy_to_month_day(year, doy)
-
-        for k in range(n_kept):
-            records.append(
-                {
-                    "lifecycle": lifecycle_index,
-                    "year_offset": year_offset,
-                    "year": year,
-                    "day_of_year": int(doy[k]),
-                    "month": int(month[k]),
-                    "day": int(day[k]),
-                    "hour": float(hour[k]),
-                    "storm_id": int(sid[k]),
-                    "rcdf": float(rcdf[k]),
-                }
+        idx_id = sampler.sample_storms(n_kept, rng)
+        parts.append((np.full(n_kept, year_offset), doy, hour, idx_id))
+
+    if not parts:
+        return pd.DataFrame.from_records([])
+
+    year_offset, doy, hour, idx_id = (np.concatenate(col) for col in zip(*parts))
+    year = init_year + year_offset
+    month, day = lcgen.utils.doy_to_month_day(year, doy)
+
+    df = pd.DataFrame(
+        {
+            "lifecycle": np.full(doy.size, lifecycle_index),
+            "year_offset": year_offset,
+            "year": year,
+            "day_of_year": doy,
+            "month": month,
+            "day": day,
+            "hour": hour,
+            "event_start": lcgen.utils.doy_to_datetime64(year, doy, hour).astype(np.int64),
+            "storm_id": sampler.storm_id[idx_id],
+            "rcdf": sampler.storm_cdf[idx_id],
+        }
+    )
+    if sampler.weighted:
+        df["weight"] = sampler.storm_weight[idx_id]
+    return df
+
+
+def simulate_lifecycles(
+    n_lifecycles: int,
+    init_year: int,
+    duration_years: int,
+    lam: float,
+    min_sep_days: float,
+    prob_schedule: pd.DataFrame,
+    storm_set: pd.DataFrame,
+    rng: Optional[np.random.Generator] = None,
+    lifecycle_start: int = 0,
+    sampler: Optional[lcgen.samplers.EventSampler] = None,
+    uniforms: Optional[lcgen.ensembles.YearUniforms] = None,
+) -> lcgen.results.LifecycleEvents:
+    """
+    Simulate many lifecycles at once.
+
+    Counts, day-of-year, hour and storm IDs for all
+    n_lifecycles x duration_years years are drawn as flat arrays, with
+    year_offsets[i]:year_offsets[i + 1] delimiting the events of year i.
+    Returns one columnar lcgen.results.LifecycleEvents, with per-event
+    likelihood weights when 'sampler' is an importance sampler.
+
+    'uniforms' (lcgen.ensembles.YearUniforms) switches counts and storm IDs
+    to antithetic or quasi-random draws; keep one instance for all batches
+    of an ensemble.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if sampler is None:
+        sampler = lcgen.samplers.EventSampler(prob_schedule, storm_set)
+
+    n_years = n_lifecycles * duration_years
+    year_u = None
+    if uniforms is not None:
+        if uniforms.duration_years != duration_years:
+            raise ValueError("uniforms were built for a different lifecycle duration")
+        year_u = uniforms.draw(lifecycle_start, n_lifecycles, rng)
+
+    # 1) storm counts for every (lifecycle, year)
+    counts = _sample_storm_counts(
+        lam,
+        n_years,
+        prob_schedule,
+        min_sep_days,
+        rng,
+        u=None if year_u is None else year_u[:, 0],
+    )
+    counts = counts.astype(np.int32)
+    year_offsets = np.zeros(n_years + 1, dtype=np.int64)
+    np.cumsum(counts, out=year_offsets[1:])
+
+    # 2) arrivals, sorted within each year
+    doy, hour = _sample_arrivals_batch(
+        counts=counts,
+        year_offsets=year_offsets,
+        prob_schedule=prob_schedule,
+        min_sep_days=min_sep_days,
+        rng=rng,
+    )
+
+    # 3) storm IDs, 4) per-year indices expanded to per-event columns
+    events = lcgen.results.LifecycleEvents(
+        init_year=init_year,
+        lifecycle=np.empty(doy.size, dtype=np.int32),
+        year_offset=np.empty(doy.size, dtype=np.int16),
+        day_of_year=doy,
+        hour=hour,
+        storm_id=np.empty(doy.size, dtype=np.int32),
+        weight=np.empty(doy.size) if sampler.weighted else None,
+    )
+    year_index = np.repeat(np.arange(n_years, dtype=np.int32), counts)
+    for start in range(0, doy.size, BATCH_CHUNK_EVENTS):
+        stop = min(start + BATCH_CHUNK_EVENTS, doy.size)
+        if year_u is None:
+            idx_id = sampler.sample_storms(stop - start, rng)
+        else:
+            idx_id = _storms_from_year_uniforms(
+                year_u, year_index[start:stop], year_offsets, start, sampler, rng
+            )
+        events.storm_id[start:stop] = sampler.storm_id[idx_id]
+        if sampler.weighted:
+            events.weight[start:stop] = sampler.storm_weight[idx_id]
+
+    np.floor_divide(year_index, duration_years, out=events.lifecycle)
+    events.lifecycle += lifecycle_start
+    np.remainder(year_index, duration_years, out=year_index)
+    events.year_offset[:] = year_index
+
+    return events
+
+
+def simulate_lifecycle_streams(
+    rngs: Sequence[np.random.Generator],
+    init_year: int,
+    duration_years: int,
+    lam: float,
+    min_sep_days: float,
+    prob_schedule: pd.DataFrame,
+    storm_set: pd.DataFrame,
+    lifecycle_start: int = 0,
+    sampler: Optional[lcgen.samplers.EventSampler] = None,
+) -> lcgen.results.LifecycleEvents:
+    """
+    Simulate lifecycles lifecycle_start, lifecycle_start + 1, ..., one per
+    generator in 'rngs', in one vectorized pass.
+
+    Each lifecycle takes its counts and all of its uniforms from its own
+    generator, so its events do not depend on which other lifecycles share
+    the call (see lcgen.streams.regenerate_lifecycles).
+    """
+    if sampler is None:
+        sampler = lcgen.samplers.EventSampler(prob_schedule, storm_set)
+    if len(rngs) == 0:
+        return lcgen.results.LifecycleEvents.empty(
+            init_year, optional=["weight"] if sampler.weighted else []
+        )
+
+    # 1) per lifecycle: storm counts, then its arrival and storm-ID uniforms
+    counts, arrival_u, storm_u = [], [], []
+    for rng in rngs:
+        lc_counts = _sample_storm_counts(
+            lam, duration_years, prob_schedule, min_sep_days, rng
+        )
+        n_events = int(lc_counts.sum())
+        counts.append(lc_counts)
+        arrival_u.append(rng.random(lcgen.arrivals.UNIFORMS_PER_STORM * n_events))
+        storm_u.append(rng.random(n_events))
+    counts = np.concatenate(counts).astype(np.int32)
+    year_offsets = np.zeros(counts.size + 1, dtype=np.int64)
+    np.cumsum(counts, out=year_offsets[1:])
+
+    # 2) arrivals of all lifecycles at once
+    doy, hour = _sample_arrivals_batch(
+        counts=counts,
+        year_offsets=year_offsets,
+        prob_schedule=prob_schedule,
+        min_sep_days=min_sep_days,
+        rng=None,
+        u=np.concatenate(arrival_u),
+    )
+
+    # 3) storm IDs, 4) per-year indices expanded to per-event columns
+    idx_id = sampler.storm_table.lookup(np.concatenate(storm_u))
+    year_index = np.repeat(np.arange(counts.size, dtype=np.int64), counts)
+    return lcgen.results.LifecycleEvents(
+        init_year=init_year,
+        lifecycle=lifecycle_start + year_index // duration_years,
+        year_offset=year_index % duration_years,
+        day_of_year=doy,
+        hour=hour,
+        storm_id=sampler.storm_id[idx_id],
+        weight=sampler.storm_weight[idx_id] if sampler.weighted else None,
+    )
+
+
+@dataclass
+class StormFamily:
+    """
+    One storm family (e.g. tropical or extratropical) for
+    simulate_joint_lifecycles: Poisson rate, within-family separation,
+    seasonal schedule and catalog. The EventSampler is built if not given.
+    """
+
+    lam: float
+    min_sep_days: float
+    prob_schedule: pd.DataFrame
+    storm_set: pd.DataFrame
+    sampler: Optional[lcgen.samplers.EventSampler] = None
+
+    def __post_init__(self):
+        if self.sampler is None:
+            self.sampler = lcgen.samplers.EventSampler(self.prob_schedule, self.storm_set)
+
+
+def simulate_joint_lifecycles(
+    n_lifecycles: int,
+    init_year: int,
+    duration_years: int,
+    families: Sequence[StormFamily],
+    cross_sep_days: float,
+    rng: Optional[np.random.Generator] = None,
+    lifecycle_start: int = 0,
+) -> lcgen.results.LifecycleEvents:
+    """
+    Simulate many lifecycles of several storm families in one pass.
+
+    Each family draws its own Poisson counts, then every year's arrivals of
+    all families are placed jointly (lcgen.arrivals.JointArrivalSampler):
+    consecutive storms of one family are at least its min_sep_days apart,
+    storms of different families at least cross_sep_days. Only consecutive
+    gaps are enforced, which covers all pairs as long as no min_sep_days
+    exceeds twice cross_sep_days; otherwise ValueError is raised. Storm IDs
+    come from each family's catalog.
+
+    Returns one merged, time-ordered lcgen.results.LifecycleEvents with a
+    'storm_type' column holding the family index.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    n_years = n_lifecycles * duration_years
+    n_families = len(families)
+
+    # 1) storm counts for every (lifecycle, year, family)
+    counts = np.stack(
+        [
+            _sample_storm_counts(f.lam, n_years, f.prob_schedule, f.min_sep_days, rng)
+            for f in families
+        ],
+        axis=1,
+    ).astype(np.int32)
+    year_offsets = np.zeros(n_years + 1, dtype=np.int64)
+    np.cumsum(counts.sum(axis=1), out=year_offsets[1:])
+
+    # 2) merged arrivals, sorted within each year
+    min_sep = np.full((n_families, n_families), float(cross_sep_days))
+    np.fill_diagonal(min_sep, [f.min_sep_days for f in families])
+    doy, hour, storm_type = _sample_joint_arrivals_batch(
+        counts=counts,
+        year_offsets=year_offsets,
+        prob_schedules=[f.prob_schedule for f in families],
+        min_sep_days=min_sep,
+        rng=rng,
+    )
+
+    # 3) storm IDs from each family's catalog
+    weighted = any(f.sampler.weighted for f in families)
+    events = lcgen.results.LifecycleEvents(
+        init_year=init_year,
+        lifecycle=np.empty(doy.size, dtype=np.int32),
+        year_offset=np.empty(doy.size, dtype=np.int16),
+        day_of_year=doy,
+        hour=hour,
+        storm_id=np.empty(doy.size, dtype=np.int32),
+        weight=np.ones(doy.size) if weighted else None,
+        storm_type=storm_type,
+    )
+    for t, family in enumerate(families):
+        rows = np.flatnonzero(storm_type == t)
+        for start in range(0, rows.size, BATCH_CHUNK_EVENTS):
+            chunk = rows[start : start + BATCH_CHUNK_EVENTS]
+            idx_id = family.sampler.sample_storms(chunk.size, rng)
+            events.storm_id[chunk] = family.sampler.storm_id[idx_id]
+            if family.sampler.weighted:
+                events.weight[chunk] = family.sampler.storm_weight[idx_id]
+
+    # 4) per-year indices expanded to per-event columns
+    year_index = np.repeat(np.arange(n_years, dtype=np.int32), counts.sum(axis=1))
+    np.floor_divide(year_index, duration_years, out=events.lifecycle)
+    events.lifecycle += lifecycle_start
+    np.remainder(year_index, duration_years, out=year_index)
+    events.year_offset[:] = year_index
+
+    return events
+
+
+def _sample_storm_counts(
+    lam: float,
+    n_years: int,
+    prob_schedule: pd.DataFrame,
+    min_sep_days: float,
+    rng: np.random.Generator,
+    u: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Sample N ~ Poisson(lam) for n_years years at once, with feasibility cap.
+
+    If 'u' is given, counts are the Poisson inverse CDF of these uniforms.
+    """
+    if u is None:
+        counts = rng.poisson(lam, n_years)
+    else:
+        counts = lcgen.ensembles.poisson_counts(lam, u)
+    max_feasible = int(np.floor(len(prob_schedule) / min_sep_days)) + 1
+    np.minimum(counts, max_feasible, out=counts)
+    return counts
+
+
+def _storms_from_year_uniforms(
+    year_u: np.ndarray,
+    year_index: np.ndarray,
+    year_offsets: np.ndarray,
+    start: int,
+    sampler: lcgen.samplers.EventSampler,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Storm rows for events start:start + len(year_index); the k-th event of a
+    year uses coordinate 1 + k of its year's point, pseudo-random beyond.
+    """
+    rank = np.arange(start, start + year_index.size) - year_offsets[year_index]
+    u = rng.random(year_index.size)
+    mask = rank < year_u.shape[1] - 1
+    u[mask] = year_u[year_index[mask], 1 + rank[mask]]
+    return sampler.storms_from_uniforms(u)
+
+
+def _sample_arrivals_batch(
+    counts: np.ndarray,
+    year_offsets: np.ndarray,
+    prob_schedule: pd.DataFrame,
+    min_sep_days: float,
+    rng: np.random.Generator,
+    u: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized arrival sampling over many years.
+
+    Years sharing the same storm count are drawn together, in chunks of
+    about BATCH_CHUNK_EVENTS events, as (n_years, n_storms) matrices from
+    the exact minimum-separation sampler. 'u' (flat, UNIFORMS_PER_STORM
+    per event in event order) replaces 'rng' as the source of uniforms.
+
+    Returns
+    -------
+    doy  : np.ndarray (int16), flat, ordered by year then time
+    hour : np.ndarray (float32), flat
+    """
+    sampler = _arrival_sampler(prob_schedule, min_sep_days)
+
+    total = int(year_offsets[-1])
+    doy = np.empty(total, dtype=lcgen.results.EVENT_DTYPES["day_of_year"])
+    hour = np.empty(total, dtype=lcgen.results.EVENT_DTYPES["hour"])
+
+    for n_storms in np.unique(counts[counts > 0]):
+        years = np.flatnonzero(counts == n_storms)
+        step = max(1, BATCH_CHUNK_EVENTS // int(n_storms))
+        for start in range(0, years.size, step):
+            chunk = years[start : start + step]
+            slots = year_offsets[chunk][:, None] + np.arange(n_storms)
+            year_u = None
+            if u is not None:
+                k = lcgen.arrivals.UNIFORMS_PER_STORM
+                year_u = u[k * year_offsets[chunk][:, None] + np.arange(k * n_storms)]
+            doy[slots], hour[slots] = sampler.sample(
+                int(n_storms), chunk.size, rng, year_u
             )
-    return pd.DataFrame.from_records(records)
+
+    return doy, hour
+
+
+def _sample_joint_arrivals_batch(
+    counts: np.ndarray,
+    year_offsets: np.ndarray,
+    prob_schedules: Sequence[pd.DataFrame],
+    min_sep_days: np.ndarray,
+    rng: np.random.Generator,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized multi-family arrival sampling over many years.
+
+    Years sharing the same per-family counts are drawn together, in chunks
+    of about BATCH_CHUNK_EVENTS events, from the joint sampler.
+
+    Returns
+    -------
+    doy        : np.ndarray (int16), flat, ordered by year then time
+    hour       : np.ndarray (float32), flat
+    storm_type : np.ndarray (int8), flat
+    """
+    sampler = _joint_arrival_sampler(prob_schedules, min_sep_days)
+
+    total = int(year_offsets[-1])
+    doy = np.empty(total, dtype=lcgen.results.EVENT_DTYPES["day_of_year"])
+    hour = np.empty(total, dtype=lcgen.results.EVENT_DTYPES["hour"])
+    storm_type = np.empty(total, dtype=lcgen.results.OPTIONAL_DTYPES["storm_type"])
+
+    sampler.reserve(counts.max(axis=0, initial=0))
+    combos, combo_index = np.unique(counts, axis=0, return_inverse=True)
+    combo_index = combo_index.ravel()
+    for c, combo in enumerate(combos):
+        n_storms = int(combo.sum())
+        if n_storms == 0:
+            continue
+        years = np.flatnonzero(combo_index == c)
+        step = max(1, BATCH_CHUNK_EVENTS // n_storms)
+        for start in range(0, years.size, step):
+            chunk = years[start : start + step]
+            slots = year_offsets[chunk][:, None] + np.arange(n_storms)
+            doy[slots], hour[slots], storm_type[slots] = sampler.sample(
+                combo, chunk.size, rng
+            )
+
+    return doy, hour, storm_type
 
 
 def _sample_year(
@@ -84,38 +490,38 @@ def _sample_year(
     prob_schedule: pd.DataFrame,
     min_sep_days: float,
     rng: Optional[np.random.Generator] = None,
+    arrival_sampler: Optional[lcgen.arrivals.SeparatedArrivalSampler] = None,
 ):
     """
     High-level: sample all storms in a given year, enforcing:
       - N ~ Poisson(lam) (with feasibility cap)
       - daily seasonality via cdf_day
-      - minimum separation via rejection sampling
+      - minimum separation via the exact (rejection-free) arrival sampler
+
+    Pass 'arrival_sampler' (compiled for prob_schedule and min_sep_days)
+    when sampling many years, to skip the cache lookup.
 
     Returns
     -------
     doy   : np.ndarray (int)
     hour  : np.ndarray (float)
-    failed: bool
     """
     if rng is None:
         rng = np.random.default_rng()
+    if arrival_sampler is None:
+        arrival_sampler = _arrival_sampler(prob_schedule, min_sep_days)
 
     # 1) storm count yearly
     yearly_storm_count = _sample_storm_count_in_year(
         lam, prob_schedule, min_sep_days, rng
     )
     if yearly_storm_count == 0:
-        return (np.array([], dtype=int), np.array([], dtype=float), True)
+        return np.array([], dtype=int), np.array([], dtype=float)
 
     # 2) sample with min separation
-    doy, hour, failed = _sample_with_minimal_arrival(
-        n_storms=yearly_storm_count,
-        prob_schedule=prob_schedule,
-        min_sep_days=min_sep_days,
-        rng=rng,
-    )
+    doy, hour = arrival_sampler.sample(yearly_storm_count, 1, rng)
 
-    return doy, hour, failed
+    return doy[0], hour[0]
 
 
 def _sample_storm_count_in_year(
@@ -141,9 +547,15 @@ def _sample_with_minimal_arrival(
     min_sep_days: float,
     rng: np.random.Generator,
     max_attempts: int = 1000,
+    stats: Optional[dict] = None,
 ) -> Tuple[np.ndarray, np.ndarray, bool]:
     """
-    Given n_events, sample DOY + hour with min separation.
+    Given n_events, sample DOY + hour with min separation by rejection.
+
+    Reference implementation of lcgen.arrivals.SeparatedArrivalSampler,
+    kept for benchmarking; acceptance collapses at high n_storms or large
+    min_sep_days. If 'stats' is given, its "attempts" and "failed" totals
+    are incremented.
     """
     if n_storms <= 0:
         return (
@@ -156,7 +568,9 @@ def _sample_with_minimal_arrival(
 
     failed = True
     gaps = None
+    attempts = 0
     for _ in range(max_attempts):
+        attempts += 1
         doy = _sample_day_of_year(prob_schedule, rng, n_storms)
         hour = rng.random(n_storms) * 24.0
 
@@ -184,13 +598,62 @@ def _sample_with_minimal_arrival(
             False,
         )
     if failed:
-        print("Failed to sample with min separation:")
-        print(f"n_storms={n_storms} min_sep_days: {min_sep_days}")
-        print(f"timestamps={timestamps}, gaps={gaps}")
+        warnings.warn(
+            f"failed to sample {n_storms} storms with min separation"
+            f" {min_sep_days} days in {max_attempts} attempts;"
+            f" returning the last draw (gaps={gaps})"
+        )
+
+    if stats is not None:
+        stats["attempts"] = stats.get("attempts", 0) + attempts
+        stats["failed"] = stats.get("failed", 0) + int(failed)
 
     return last_doy, last_hour, failed
 
 
+# compiled arrival samplers keyed by (schedule, min_sep_days)
+_ARRIVAL_SAMPLERS: dict[tuple, lcgen.arrivals.SeparatedArrivalSampler] = {}
+
+
+def _arrival_sampler(
+    prob_schedule: pd.DataFrame, min_sep_days: float
+) -> lcgen.arrivals.SeparatedArrivalSampler:
+    """
+    Return the cached exact arrival sampler for this schedule.
+    """
+    key = (
+        prob_schedule["trop_day_cdf"].to_numpy().tobytes(),
+        prob_schedule["day_of_year"].to_numpy().tobytes(),
+        float(min_sep_days),
+    )
+    if key not in _ARRIVAL_SAMPLERS:
+        _ARRIVAL_SAMPLERS[key] = lcgen.arrivals.SeparatedArrivalSampler(
+            prob_schedule, min_sep_days
+        )
+    return _ARRIVAL_SAMPLERS[key]
+
+
+# compiled joint samplers keyed by (schedules, separation matrix)
+_JOINT_ARRIVAL_SAMPLERS: dict[tuple, lcgen.arrivals.JointArrivalSampler] = {}
+
+
+def _joint_arrival_sampler(
+    prob_schedules: Sequence[pd.DataFrame], min_sep_days: np.ndarray
+) -> lcgen.arrivals.JointArrivalSampler:
+    """
+    Return the cached joint arrival sampler for these schedules.
+    """
+    key = tuple(
+        (s["trop_day_cdf"].to_numpy().tobytes(), s["day_of_year"].to_numpy().tobytes())
+        for s in prob_schedules
+    ) + (np.asarray(min_sep_days, dtype=float).tobytes(),)
+    if key not in _JOINT_ARRIVAL_SAMPLERS:
+        _JOINT_ARRIVAL_SAMPLERS[key] = lcgen.arrivals.JointArrivalSampler(
+            prob_schedules, min_sep_days
+        )
+    return _JOINT_ARRIVAL_SAMPLERS[key]
+
+
 def _sample_day_of_year(
     prob_schedule: pd.DataFrame,
     rng: np.random.Generator,
@@ -199,6 +662,7 @@ def _sample_day_of_year(
     """
     Sample n day-of-year from a daily CDF.
     """
-    u = rng.random(n)
-    idx = np.searchsorted(prob_schedule["trop_day_cdf"], u, side="right")
-    return prob_schedule.iloc[idx]["day_of_year"].to_numpy().astype(int)
+    day_cdf = prob_schedule["trop_day_cdf"].to_numpy()
+    idx = np.searchsorted(day_cdf, rng.random(n), side="right")
+    np.minimum(idx, day_cdf.size - 1, out=idx)
+    return prob_schedule["day_of_year"].to_numpy().astype(int)[idx]
@@ -0,0 +1,245 @@
+# conversion/lifecycle-generation/lcgen/shards.py
+import contextlib
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+import lcgen
+
+# run_shard (one node) → lcgen.parallel.simulate_lifecycles_parallel (one pool) → <directory>/shard_<i>/
+# merge_shards → manifests checked → lcgen.output.iter_event_frames per shard → one dataset
+# run_shards_locally → run_shard per process (stands in for the nodes)
+#
+# Shard i of n owns lifecycles shard_range(n_lifecycles, n, i). Every
+# lifecycle draws from lcgen.streams.lifecycle_rng(seed, k), so the merged
+# output is the same for any number of shards or nodes. A shard is complete
+# once its manifest.json exists; it is written last. Manifests record the
+# run settings and a fingerprint of the schedule and storm set actually
+# sampled, and merge_shards only combines shards that agree on them.
+
+MANIFEST_NAME = "manifest.json"
+
+
+def shard_range(n_lifecycles: int, n_shards: int, shard_index: int) -> tuple[int, int]:
+    """
+    Lifecycle range [start, stop) of shard 'shard_index'; sizes differ by at
+    most one and the ranges tile [0, n_lifecycles).
+    """
+    if not 0 <= shard_index < n_shards:
+        raise ValueError(f"shard_index must be in [0, {n_shards}), got {shard_index}")
+    base, extra = divmod(n_lifecycles, n_shards)
+    start = shard_index * base + min(shard_index, extra)
+    return start, start + base + (shard_index < extra)
+
+
+def shard_directory(directory, shard_index: int) -> Path:
+    return Path(directory) / f"shard_{shard_index:04d}"
+
+
+def run_shard(
+    directory,
+    shard_index: int,
+    n_shards: int,
+    n_lifecycles: int,
+    init_year: int,
+    duration_years: int,
+    lam: float,
+    min_sep_days: float,
+    prob_schedule: pd.DataFrame,
+    storm_set: pd.DataFrame,
+    seed: int,
+    workers: Optional[int] = None,
+    lcs_per_batch: int = 1000,
+    bit_generator: str = "philox",
+    output_format: str = "csv",
+    settings: Optional[dict] = None,
+) -> dict:
+    """
+    Generate and write this node's shard, then its manifest.
+
+    'settings' (JSON-serializable, e.g. storm set options and input file
+    digests) is stored in the manifest and must match across shards.
+
+    Returns the manifest: shard layout, seed and run settings, the input
+    fingerprint and the number of events written.
+    """
+    start, stop = shard_range(n_lifecycles, n_shards, shard_index)
+    out_dir = shard_directory(directory, shard_index)
+    (out_dir / MANIFEST_NAME).unlink(missing_ok=True)
+
+    pool = None
+    if workers != 1:
+        pool = lcgen.parallel.lifecycle_pool(prob_schedule, storm_set, workers)
+
+    n_events = 0
+    with lcgen.output.event_writer(out_dir, output_format) as writer, (
+        pool or contextlib.nullcontext()
+    ):
+        for batch_start in range(start, stop, lcs_per_batch):
+            events = lcgen.parallel.simulate_lifecycles_parallel(
+                n_lifecycles=min(lcs_per_batch, stop - batch_start),
+                init_year=init_year,
+                duration_years=duration_years,
+                lam=lam,
+                min_sep_days=min_sep_days,
+                prob_schedule=prob_schedule,
+                storm_set=storm_set,
+                seed=seed,
+                workers=workers,
+                lifecycle_start=batch_start,
+                bit_generator=bit_generator,
+                pool=pool,
+            )
+            writer.write(events)
+            n_events += len(events)
+
+    manifest = {
+        "shard_index": shard_index,
+        "n_shards": n_shards,
+        "lifecycle_start": start,
+        "lifecycle_stop": stop,
+        "n_lifecycles": n_lifecycles,
+        "n_events": n_events,
+        "seed": seed,
+        "bit_generator": bit_generator,
+        "init_year": init_year,
+        "duration_years": duration_years,
+        "lam": lam,
+        "min_sep_days": min_sep_days,
+        "output_format": output_format,
+        "settings": settings or {},
+        "inputs": input_fingerprint(prob_schedule, storm_set),
+    }
+    tmp = out_dir / (MANIFEST_NAME + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp, out_dir / MANIFEST_NAME)
+    return manifest
+
+
+def input_fingerprint(prob_schedule: pd.DataFrame, storm_set: pd.DataFrame) -> str:
+    """
+    SHA-256 of the schedule and storm set contents (columns and values), so
+    shards drawn from different storm sets, e.g. with and without an
+    importance proposal, are told apart.
+    """
+    digest = hashlib.sha256()
+    for df in (prob_schedule, storm_set):
+        digest.update(json.dumps([str(c) for c in df.columns]).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def run_shards_locally(directory, n_shards: int, **shard_kwargs) -> list[dict]:
+    """
+    Run every shard in its own process, standing in for n_shards nodes.
+
+    Each shard runs its lifecycles in-process (workers=1); shard_kwargs are
+    the remaining run_shard arguments.
+    """
+    shard_kwargs = {**shard_kwargs, "workers": 1}
+    with ProcessPoolExecutor(max_workers=n_shards) as pool:
+        futures = [
+            pool.submit(run_shard, directory, i, n_shards, **shard_kwargs)
+            for i in range(n_shards)
+        ]
+        return [f.result() for f in futures]
+
+
+def merge_shards(directory, output_directory, output_format: str = "csv") -> dict:
+    """
+    Check that the shards in 'directory' are complete and consistent, and
+    combine them into one lifecycle-ordered EventDate_LC in output_directory.
+
+    Raises ValueError on a missing or unfinished shard, mismatched settings,
+    index ranges that do not tile [0, n_lifecycles), events outside their
+    shard's range or an event count that differs from the manifest.
+    Returns a summary of the merged dataset.
+    """
+    manifests = _check_manifests(directory)
+
+    n_events = 0
+    with lcgen.output.event_writer(output_directory, output_format) as writer:
+        for m in manifests:
+            shard_dir = shard_directory(directory, m["shard_index"])
+            source = shard_dir / (
+                "EventDate_LC" if m["output_format"] == "parquet" else "EventDate_LC.csv"
+            )
+            shard_events = 0
+            for df in lcgen.output.iter_event_frames(source):
+                events = lcgen.results.LifecycleEvents.from_output_frame(df, m["init_year"])
+                if len(events) and (
+                    events.lifecycle.min() < m["lifecycle_start"]
+                    or events.lifecycle.max() >= m["lifecycle_stop"]
+                ):
+                    raise ValueError(
+                        f"shard {m['shard_index']} holds lifecycles outside"
+                        f" [{m['lifecycle_start']}, {m['lifecycle_stop']})"
+                    )
+                writer.write(events)
+                shard_events += len(events)
+            if shard_events != m["n_events"]:
+                raise ValueError(
+                    f"shard {m['shard_index']} has {shard_events} events,"
+                    f" its manifest says {m['n_events']}"
+                )
+            n_events += shard_events
+
+    return {
+        "n_shards": len(manifests),
+        "n_lifecycles": manifests[0]["n_lifecycles"],
+        "n_events": n_events,
+        "seed": manifests[0]["seed"],
+    }
+
+
+def _check_manifests(directory) -> list[dict]:
+    """
+    Load all shard manifests, ordered by shard index, and validate them.
+    """
+    paths = sorted(Path(directory).glob(f"shard_*/{MANIFEST_NAME}"))
+    if not paths:
+        raise ValueError(f"no finished shards in {directory}")
+    manifests = sorted(
+        (json.loads(p.read_text()) for p in paths), key=lambda m: m["shard_index"]
+    )
+
+    shared = (
+        "n_shards",
+        "n_lifecycles",
+        "seed",
+        "bit_generator",
+        "init_year",
+        "duration_years",
+        "lam",
+        "min_sep_days",
+        "settings",
+        "inputs",
+    )
+    for key in shared:
+        values = {json.dumps(m.get(key), sort_keys=True) for m in manifests}
+        if len(values) > 1:
+            raise ValueError(f"shards disagree on {key}: {sorted(values)}")
+
+    n_shards = manifests[0]["n_shards"]
+    missing = sorted(set(range(n_shards)) - {m["shard_index"] for m in manifests})
+    if missing:
+        raise ValueError(f"shards {missing} of {n_shards} are missing or unfinished")
+
+    expected = 0
+    for m in manifests:
+        if m["lifecycle_start"] != expected:
+            raise ValueError(
+                f"shard {m['shard_index']} starts at lifecycle {m['lifecycle_start']},"
+                f" expected {expected}"
+            )
+        expected = m["lifecycle_stop"]
+    if expected != manifests[0]["n_lifecycles"]:
+        raise ValueError(
+            f"shards cover {expected} of {manifests[0]['n_lifecycles']} lifecycles"
+        )
+    return manifests
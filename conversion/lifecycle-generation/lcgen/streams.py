@@ -0,0 +1,111 @@
+# conversion/lifecycle-generation/lcgen/streams.py
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+import lcgen
+
+# Per-lifecycle random streams, reproducible from (master seed, lifecycle index).
+#   "pcg64"  : PCG64 seeded by the lifecycle's child SeedSequence
+#   "philox" : counter-based Philox keyed by the master seed, with the
+#              lifecycle index in the top 64 bits of the 256-bit counter
+BIT_GENERATORS = ("pcg64", "philox")
+
+
+def lifecycle_seed_sequence(seed: int, lifecycle_index: int) -> np.random.SeedSequence:
+    """
+    Child SeedSequence of lifecycle 'lifecycle_index' under the master 'seed'.
+
+    Identical to np.random.SeedSequence(seed).spawn(n)[lifecycle_index] for any
+    n > lifecycle_index, but built directly so any lifecycle can be seeded
+    without spawning the ones before it.
+    """
+    return np.random.SeedSequence(entropy=seed, spawn_key=(lifecycle_index,))
+
+
+def lifecycle_rng(
+    seed: int, lifecycle_index: int, bit_generator: str = "philox"
+) -> np.random.Generator:
+    """
+    Independent Generator for one lifecycle, reproducible from (seed, index).
+    """
+    if bit_generator == "pcg64":
+        return np.random.default_rng(lifecycle_seed_sequence(seed, lifecycle_index))
+    if bit_generator == "philox":
+        return np.random.Generator(
+            np.random.Philox(
+                key=philox_key(seed), counter=int(lifecycle_index) << 192
+            )
+        )
+    raise ValueError(
+        f"unknown bit_generator '{bit_generator}', expected one of {BIT_GENERATORS}"
+    )
+
+
+@lru_cache(maxsize=16)
+def philox_key(seed: int) -> np.ndarray:
+    """
+    128-bit Philox key derived from the master seed (read-only, cached).
+    """
+    key = np.random.SeedSequence(seed).generate_state(2, dtype=np.uint64)
+    key.setflags(write=False)
+    return key
+
+
+def save_point_seed(seed: int, save_point: int) -> int:
+    """
+    Master seed of one save point of a multi-save-point run, derived from
+    the run's master 'seed'. Lifecycle k of that save point draws from
+    lifecycle_rng(save_point_seed(seed, save_point), k), so
+    regenerate_lifecycles rebuilds it with this seed and the save point's
+    storm set.
+    """
+    sequence = np.random.SeedSequence(seed, spawn_key=(int(save_point),))
+    return int.from_bytes(sequence.generate_state(4).tobytes(), "little")
+
+
+def new_master_seed() -> int:
+    """
+    Draw fresh OS entropy for a master seed. Print/log it to reproduce a run.
+    """
+    return int(np.random.SeedSequence().entropy)
+
+
+def regenerate_lifecycles(
+    seed: int,
+    lifecycle_start: int,
+    lifecycle_stop: int,
+    init_year: int,
+    duration_years: int,
+    lam: float,
+    min_sep_days: float,
+    prob_schedule: pd.DataFrame,
+    storm_set: pd.DataFrame,
+    bit_generator: str = "philox",
+    sampler: Optional[lcgen.samplers.EventSampler] = None,
+) -> lcgen.results.LifecycleEvents:
+    """
+    Recompute lifecycles [lifecycle_start, lifecycle_stop) on demand.
+
+    Matches what lcgen.parallel.simulate_lifecycles_parallel produced for
+    those indices with the same seed, bit_generator and inputs, so
+    downstream workers can rebuild their own shard instead of reading the
+    event file.
+    """
+    rngs = [
+        lifecycle_rng(seed, lc, bit_generator)
+        for lc in range(lifecycle_start, lifecycle_stop)
+    ]
+    return lcgen.sampling.simulate_lifecycle_streams(
+        rngs,
+        init_year=init_year,
+        duration_years=duration_years,
+        lam=lam,
+        min_sep_days=min_sep_days,
+        prob_schedule=prob_schedule,
+        storm_set=storm_set,
+        lifecycle_start=lifecycle_start,
+        sampler=sampler,
+    )
@@ -1,17 +1,85 @@
-import datetime as dt
 import numpy as np
 
+# Day-of-year → (month, day) lookup tables, row 0 non-leap, row 1 leap.
+# Column d holds day-of-year d (column 0 unused).
+_MONTH_LENGTHS = np.array(
+    [
+        [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31],
+        [31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31],
+    ]
+)
+_MONTH_OF_DOY = np.zeros((2, 367), dtype=np.int8)
+_DAY_OF_DOY = np.zeros((2, 367), dtype=np.int8)
+for _leap, _lengths in enumerate(_MONTH_LENGTHS):
+    _MONTH_OF_DOY[_leap, 1 : _lengths.sum() + 1] = np.repeat(np.arange(1, 13), _lengths)
+    _DAY_OF_DOY[_leap, 1 : _lengths.sum() + 1] = np.concatenate(
+        [np.arange(1, n + 1) for n in _lengths]
+    )
+# Day-of-year before the 1st of each month, [leap, month] (column 0 unused)
+_DOY_BEFORE_MONTH = np.zeros((2, 13), dtype=np.int64)
+_DOY_BEFORE_MONTH[:, 1:] = np.cumsum(_MONTH_LENGTHS, axis=1) - _MONTH_LENGTHS
 
-def doy_to_month_day(year: int, doy: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+
+def is_leap_year(year) -> np.ndarray:
     """
-    Vectorized DOY → (month, day) converter.
+    Vectorized Gregorian leap-year test.
+    """
+    year = np.asarray(year)
+    return (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+
+
+def doy_to_month_day(year, doy: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
     """
-    base = dt.datetime(year, 1, 1)
+    Vectorized DOY → (month, day) converter.
 
-    # Convert DOY → datetime
-    dt_arr = np.array([base + dt.timedelta(days=int(d) - 1) for d in doy])
+    'year' may be a scalar or an array broadcastable against 'doy', so
+    events from many years convert in one table lookup.
+    """
+    doy = np.asarray(doy, dtype=np.int64)
+    leap = is_leap_year(year).astype(np.int64)
+    if doy.size and (
+        np.any(doy < 1) or np.any(doy > 365 + np.broadcast_to(leap, doy.shape))
+    ):
+        raise ValueError("day of year out of range for its year")
 
-    month = np.array([x.month for x in dt_arr], dtype=int)
-    day = np.array([x.day for x in dt_arr], dtype=int)
+    month = _MONTH_OF_DOY[leap, doy].astype(int)
+    day = _DAY_OF_DOY[leap, doy].astype(int)
 
     return month, day
+
+
+def month_day_to_doy(year, month: np.ndarray, day: np.ndarray) -> np.ndarray:
+    """
+    Vectorized (month, day) → DOY, the inverse of doy_to_month_day.
+    """
+    leap = is_leap_year(year).astype(np.int64)
+    month = np.asarray(month, dtype=np.int64)
+    return _DOY_BEFORE_MONTH[leap, month] + np.asarray(day, dtype=np.int64)
+
+
+def doy_to_datetime64(year, doy: np.ndarray, hour=0.0) -> np.ndarray:
+    """
+    Vectorized (year, DOY, fractional hour) → datetime64[s] event timestamp.
+
+    The hour is truncated to whole seconds, so a timestamp never rolls over
+    into the next day.
+    """
+    year = np.asarray(year, dtype=np.int64)
+    doy = np.asarray(doy, dtype=np.int64)
+    jan1 = (year - 1970).astype("datetime64[Y]").astype("datetime64[D]")
+    seconds = np.floor(np.asarray(hour, dtype=float) * 3600.0).astype(np.int64)
+    return (
+        jan1.astype("datetime64[s]")
+        + (doy - 1).astype("timedelta64[D]")
+        + seconds.astype("timedelta64[s]")
+    )
+
+
+def doy_to_dates(
+    year, doy: np.ndarray, hour=0.0
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized DOY → (month, day, datetime64[s] timestamp) for whole arrays.
+    """
+    month, day = doy_to_month_day(year, doy)
+    return month, day, doy_to_datetime64(year, doy, hour)
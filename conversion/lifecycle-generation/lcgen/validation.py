@@ -1,4 +1,8 @@
+from typing import Optional
+
+import numpy as np
 import pandas as pd
+from scipy import stats
 
 
 def compute_storm_counts(df_all: pd.DataFrame) -> pd.DataFrame:
@@ -32,3 +36,175 @@ def verify_lambda(counts: pd.DataFrame, lambda_target: float) -> None:
     print("\nk | empirical P(N=k)")
     for k, p in emp_prob.items():
         print(f"{k:2d} | {p:.4f}")
+
+
+class StreamingValidation:
+    """
+    Online validation accumulators, updated batch by batch during generation.
+
+    State is a handful of histograms (storm count per year, month, storm ID),
+    so memory does not grow with the number of lifecycles. Unlike
+    compute_storm_counts, years without storms are counted.
+
+    Standard errors treat lifecycles as independent replicates, which is
+    conservative for antithetic / Sobol ensembles (lcgen.ensembles).
+    """
+
+    def __init__(
+        self,
+        lambda_target: float,
+        duration_years: int,
+        storm_set: pd.DataFrame,
+        prob_schedule: Optional[pd.DataFrame] = None,
+    ):
+        self.lambda_target = lambda_target
+        self.duration_years = duration_years
+        self.n_lifecycles = 0
+
+        self.count_hist = np.zeros(1, dtype=np.int64)
+        # per-lifecycle mean annual count: running sum and sum of squares
+        self._lc_sum = 0.0
+        self._lc_sumsq = 0.0
+        self.month_hist = np.zeros(13, dtype=np.int64)
+
+        self.storm_ids = storm_set["storm_id"].to_numpy()
+        self.storm_prob = storm_set["prob"].to_numpy()
+        self.storm_hist = np.zeros(self.storm_ids.size, dtype=np.int64)
+        # likelihood-weighted storm histogram; equals storm_hist without IS
+        self.storm_mass = np.zeros(self.storm_ids.size)
+        self._storm_index = np.full(self.storm_ids.max() + 1, -1, dtype=np.int64)
+        self._storm_index[self.storm_ids] = np.arange(self.storm_ids.size)
+
+        self.month_prob = None
+        if prob_schedule is not None:
+            mass = np.diff(prob_schedule["trop_day_cdf"].to_numpy(), prepend=0.0)
+            self.month_prob = np.bincount(
+                prob_schedule["month"].to_numpy(), weights=mass, minlength=13
+            )
+
+    def update(self, events, lifecycle_start: int, n_lifecycles: int) -> None:
+        """
+        Add a batch holding lifecycles [lifecycle_start, lifecycle_start + n_lifecycles).
+        """
+        n_years = n_lifecycles * self.duration_years
+        year_index = (
+            events.lifecycle.astype(np.int64) - lifecycle_start
+        ) * self.duration_years + events.year_offset
+        counts = np.bincount(year_index, minlength=n_years)
+        if counts.size != n_years:
+            raise ValueError("events fall outside the declared lifecycle range")
+
+        hist = np.bincount(counts)
+        if hist.size > self.count_hist.size:
+            self.count_hist = np.pad(self.count_hist, (0, hist.size - self.count_hist.size))
+        self.count_hist[: hist.size] += hist
+
+        lc_mean = counts.reshape(n_lifecycles, self.duration_years).mean(axis=1)
+        self._lc_sum += float(lc_mean.sum())
+        self._lc_sumsq += float((lc_mean**2).sum())
+
+        month, _ = events.month_day()
+        self.month_hist += np.bincount(month, minlength=13)
+
+        ids = events.storm_id
+        if ids.size and (ids.max() >= self._storm_index.size or ids.min() < 0):
+            raise ValueError("events reference storm IDs outside the catalog")
+        idx = self._storm_index[ids]
+        if np.any(idx < 0):
+            raise ValueError("events reference storm IDs outside the catalog")
+        self.storm_hist += np.bincount(idx, minlength=self.storm_hist.size)
+        self.storm_mass += np.bincount(
+            idx,
+            weights=events.weight if events.weighted else None,
+            minlength=self.storm_mass.size,
+        )
+
+        self.n_lifecycles += n_lifecycles
+
+    @property
+    def n_years(self) -> int:
+        return int(self.count_hist.sum())
+
+    @property
+    def n_events(self) -> int:
+        return int(self.storm_hist.sum())
+
+    @property
+    def mean(self) -> float:
+        k = np.arange(self.count_hist.size)
+        return float((k * self.count_hist).sum() / max(self.n_years, 1))
+
+    @property
+    def variance(self) -> float:
+        k = np.arange(self.count_hist.size)
+        m2 = (k**2 * self.count_hist).sum() / max(self.n_years, 1)
+        return float(m2 - self.mean**2)
+
+    @property
+    def mean_se(self) -> float:
+        """
+        Standard error of the mean annual storm count, from the spread of
+        per-lifecycle means (inf before two lifecycles).
+        """
+        n = self.n_lifecycles
+        if n < 2:
+            return float("inf")
+        var = (self._lc_sumsq - self._lc_sum**2 / n) / (n - 1)
+        return float(np.sqrt(max(var, 0.0) / n))
+
+    def converged(
+        self,
+        mean_se_tol: Optional[float] = None,
+        storm_error_tol: Optional[float] = None,
+    ) -> bool:
+        """
+        True once every given tolerance is met: mean_se <= mean_se_tol and
+        storm_frequency_error() <= storm_error_tol. None skips a check.
+        """
+        if self.n_lifecycles == 0:
+            return False
+        if mean_se_tol is not None and self.mean_se > mean_se_tol:
+            return False
+        if storm_error_tol is not None and self.storm_frequency_error() > storm_error_tol:
+            return False
+        return True
+
+    def storm_frequency_error(self) -> float:
+        """
+        Total-variation distance between empirical storm-ID frequencies and
+        the DSW probabilities; importance-sampled events count with their
+        likelihood weights.
+        """
+        total = self.storm_mass.sum()
+        emp = self.storm_mass / (total if total > 0 else 1.0)
+        return float(0.5 * np.abs(emp - self.storm_prob).sum())
+
+    def report(self) -> None:
+        """
+        Print the same summary as verify_lambda plus seasonality and storm-ID checks.
+        """
+        print("\n--- Storm Count Verification ---")
+        print(f"Lifecycles:          {self.n_lifecycles}")
+        print(f"Target lambda:       {self.lambda_target:.4f}")
+        print(f"Empirical mean:      {self.mean:.4f} (SE {self.mean_se:.4f})")
+        print(f"Empirical variance:  {self.variance:.4f}")
+
+        emp_prob = self.count_hist / max(self.n_years, 1)
+        print("\nk | empirical P(N=k) | Poisson P(N=k)")
+        for k, p in enumerate(emp_prob):
+            print(f"{k:2d} | {p:.4f}           | {stats.poisson.pmf(k, self.lambda_target):.4f}")
+
+        print("\n--- Seasonality (events per month) ---")
+        month_emp = self.month_hist / max(self.n_events, 1)
+        print("month | empirical" + (" | schedule" if self.month_prob is not None else ""))
+        for m in range(1, 13):
+            if self.month_hist[m] == 0 and (self.month_prob is None or self.month_prob[m] == 0):
+                continue
+            line = f"{m:5d} | {month_emp[m]:.4f}"
+            if self.month_prob is not None:
+                line += f"    | {self.month_prob[m]:.4f}"
+            print(line)
+
+        print("\n--- Storm ID Frequency ---")
+        print(f"Events:              {self.n_events}")
+        print(f"TV distance to DSW:  {self.storm_frequency_error():.4f}")
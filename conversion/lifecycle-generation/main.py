@@ -1,3 +1,4 @@
+import contextlib
 from pathlib import Path
 
 import numpy as np
@@ -11,76 +12,334 @@ import lcgen
 # -----------------------------
 INITIALIZE_YEAR = 2033
 LIFECYCLE_DURATION = 50  # number of years in a lifecycle
-NUM_LCS = 100  # number of lifecycles
+NUM_LCS = 100  # number of lifecycles (upper bound when ADAPTIVE)
 LAM_TARGET = 1.7  # local storm recurrence rate (Poisson lambda)
+INTENSITY_BUCKETS = False  # set to True to take rates and storm IDs per SRR bucket from BUCKET_FILE
 
 # minimum separation between storms in days
 MIN_ARRIVAL_TROP_DAYS = 7.0
-MIN_ARRIVAL_EXTRA_DAYS = 4.0  # not used yet, but kept for future
+MIN_ARRIVAL_EXTRA_DAYS = 4.0
+MIN_ARRIVAL_CROSS_DAYS = 4.0  # between a tropical and an extratropical storm
 
 REL_PROB_FILE = "../data/raw/conversion-lifecycle-generation/Relative_probability_bins_Atlantic 4.csv"
 STORM_ID_PROB_FILE = (
     "../data/intermediate/conversion-lifecycle-generation/stormprob.csv"
 )
+BUCKET_FILE = (  # written by setup_SRR_DSW.py; replaces LAM_TARGET when INTENSITY_BUCKETS
+    "../data/intermediate/conversion-lifecycle-generation/intensity_buckets.csv"
+)
+SAVE_POINTS_FILE = None  # bucket table with a 'save_point' column; runs every site into sp_<id>/
+
+# extratropical family, used when JOINT_EXTRA (defaults reuse the tropical inputs)
+LAM_EXTRA = 1.0
+EXTRA_REL_PROB_FILE = REL_PROB_FILE
+EXTRA_CDF_COLUMN = "Cumulative trop prob"  # e.g. "Cumulative extra prob"
+EXTRA_STORM_ID_PROB_FILE = STORM_ID_PROB_FILE
 OUTPUT_DIRECTORY = Path("../data/intermediate/conversion-lifecycle-generation/")
+CACHE_DIRECTORY = OUTPUT_DIRECTORY / ".lcgen-cache"  # binary cache of parsed inputs; None disables
+CHECKPOINT_FILE = OUTPUT_DIRECTORY / "EventDate_LC.checkpoint"  # resume state; None disables
 
-RNG = np.random.default_rng()  # consistent RNG
+SEED = None  # master seed; None draws fresh entropy (printed so the run can be reproduced)
 PROFILE = False  # set to True to enable cProfile profiling
 VALIDATE_LAMBDA = False  # set to True to run validation after simulating
+BATCH = True  # set to True to simulate each batch of lifecycles in one vectorized pass
+PARALLEL = False  # set to True to spread lifecycles over a process pool
+WORKERS = None  # process pool size; None uses all cores
+BIT_GENERATOR = "philox"  # per-lifecycle streams: counter-based "philox" or "pcg64"
+LCS_PER_BATCH = 1000  # lifecycles generated and flushed to output per batch
+OUTPUT_FORMAT = "csv"  # "csv" (EventDate_LC.csv) or "parquet" (EventDate_LC/ dataset)
+IMPORTANCE_SAMPLING = False  # set to True to oversample high-dP storms and write a 'weight' column
+IS_DP_EDGES = lcgen.samplers.IS_DP_EDGES  # dP bucket edges (hPa) for importance sampling
+IS_BUCKET_SHARE = None  # proposal share per dP bucket; None gives every bucket an equal share
+ADAPTIVE = False  # set to True to stop after the first batch meeting the tolerances below
+TOL_MEAN_SE = 0.01  # target standard error of the mean annual storm count (None skips)
+TOL_STORM_ERROR = None  # target TV distance of storm-ID frequencies to DSW (None skips)
+ENSEMBLE = "mc"  # "mc", "antithetic" or "sobol" counts / storm IDs (batch engine only)
+JOINT_EXTRA = False  # set to True to add extratropical storms in one merged pass (batch engine only)
 
 
 # -----------------------------
 # MAIN DRIVER
 # -----------------------------
 def main():
+    check_config()
     OUTPUT_DIRECTORY.mkdir(parents=True, exist_ok=True)
-    prob_schedule: pd.DataFrame = lcgen.load.load_relative_probabilities(REL_PROB_FILE)
-    storm_set: pd.DataFrame = lcgen.load.load_storm_id_cdf(STORM_ID_PROB_FILE)
-
-    # Columns for split outputs
-    cols = [
-        "lifecycle",
-        "year_offset",
-        "year",
-        "month",
-        "day",
-        "hour",
-        "storm_id",
-        # "rcdf",
-    ]
-
-    all_dfs: list[pd.DataFrame] = []
-
-    # Full simulation using calibrated lambda
-    for lc in range(NUM_LCS):
-        df = lcgen.sampling.simulate_lifecycle(
-            lifecycle_index=lc,
-            init_year=INITIALIZE_YEAR,
-            duration_years=LIFECYCLE_DURATION,
-            lam=LAM_TARGET,
-            min_sep_days=MIN_ARRIVAL_TROP_DAYS,
-            prob_schedule=prob_schedule,
-            storm_set=storm_set,
-            show_progress=False,
+    prob_schedule: pd.DataFrame = lcgen.load.load_relative_probabilities(
+        REL_PROB_FILE, cache_dir=CACHE_DIRECTORY
+    )
+    storm_set: pd.DataFrame = lcgen.load.load_storm_id_cdf(
+        STORM_ID_PROB_FILE, cache_dir=CACHE_DIRECTORY
+    )
+    if SAVE_POINTS_FILE is not None:
+        run_save_points(prob_schedule, storm_set)
+        return
+    lam, storm_set = tropical_inputs(storm_set)
+    sampler = lcgen.samplers.EventSampler(prob_schedule, storm_set)
+
+    checkpoint, state = None, None
+    if CHECKPOINT_FILE is not None:
+        checkpoint = lcgen.checkpoint.RunCheckpoint(CHECKPOINT_FILE, _run_config())
+        state = checkpoint.load()
+    first_lifecycle = 0 if state is None else state["next_lifecycle"]
+
+    # one master seed drives every mode: the generator of the serial and
+    # batch engines, the PARALLEL lifecycle streams and the Sobol' scrambling
+    if state is not None:
+        seed = state["seed"]
+    else:
+        seed = lcgen.streams.new_master_seed() if SEED is None else SEED
+    print(f"Master seed: {seed}")
+    rng = np.random.default_rng(seed)
+
+    families = None
+    if JOINT_EXTRA:
+        if PARALLEL or not BATCH or ENSEMBLE != "mc":
+            raise ValueError(
+                "JOINT_EXTRA needs BATCH = True, PARALLEL = False and ENSEMBLE = 'mc'"
+            )
+        extra_schedule = lcgen.load.load_relative_probabilities(
+            EXTRA_REL_PROB_FILE, EXTRA_CDF_COLUMN, cache_dir=CACHE_DIRECTORY
+        )
+        extra_set = lcgen.load.load_storm_id_cdf(
+            EXTRA_STORM_ID_PROB_FILE, cache_dir=CACHE_DIRECTORY
         )
+        families = [
+            lcgen.sampling.StormFamily(
+                lam, MIN_ARRIVAL_TROP_DAYS, prob_schedule, storm_set, sampler
+            ),
+            lcgen.sampling.StormFamily(
+                LAM_EXTRA, MIN_ARRIVAL_EXTRA_DAYS, extra_schedule, extra_set
+            ),
+        ]
+
+    uniforms = None
+    if ENSEMBLE != "mc":
+        if PARALLEL or not BATCH:
+            raise ValueError("ENSEMBLE schemes need BATCH = True and PARALLEL = False")
+        uniforms = lcgen.ensembles.YearUniforms(ENSEMBLE, LIFECYCLE_DURATION, seed=seed)
+
+    validation = lcgen.validation.StreamingValidation(
+        lam, LIFECYCLE_DURATION, storm_set, prob_schedule
+    )
+
+    if state is not None:
+        print(f"Resuming from checkpoint at lifecycle {first_lifecycle}")
+        rng.bit_generator.state = state["rng"]
+        uniforms = state["uniforms"]
+        validation = state["validation"]
+
+    writer = lcgen.output.event_writer(
+        OUTPUT_DIRECTORY, OUTPUT_FORMAT, resume=None if state is None else state["writer"]
+    )
+    # one process pool for every batch of the run
+    pool = None
+    if PARALLEL and WORKERS != 1:
+        pool = lcgen.parallel.lifecycle_pool(prob_schedule, storm_set, WORKERS)
+
+    with writer, pool or contextlib.nullcontext():
+        for batch_start in range(first_lifecycle, NUM_LCS, LCS_PER_BATCH):
+            n_batch = min(LCS_PER_BATCH, NUM_LCS - batch_start)
+
+            if PARALLEL:
+                events = lcgen.parallel.simulate_lifecycles_parallel(
+                    n_lifecycles=n_batch,
+                    init_year=INITIALIZE_YEAR,
+                    duration_years=LIFECYCLE_DURATION,
+                    lam=lam,
+                    min_sep_days=MIN_ARRIVAL_TROP_DAYS,
+                    prob_schedule=prob_schedule,
+                    storm_set=storm_set,
+                    seed=seed,
+                    workers=WORKERS,
+                    lifecycle_start=batch_start,
+                    bit_generator=BIT_GENERATOR,
+                    pool=pool,
+                )
+            elif JOINT_EXTRA:
+                events = lcgen.sampling.simulate_joint_lifecycles(
+                    n_lifecycles=n_batch,
+                    init_year=INITIALIZE_YEAR,
+                    duration_years=LIFECYCLE_DURATION,
+                    families=families,
+                    cross_sep_days=MIN_ARRIVAL_CROSS_DAYS,
+                    rng=rng,
+                    lifecycle_start=batch_start,
+                )
+            elif BATCH:
+                events = lcgen.sampling.simulate_lifecycles(
+                    n_lifecycles=n_batch,
+                    init_year=INITIALIZE_YEAR,
+                    duration_years=LIFECYCLE_DURATION,
+                    lam=lam,
+                    min_sep_days=MIN_ARRIVAL_TROP_DAYS,
+                    prob_schedule=prob_schedule,
+                    storm_set=storm_set,
+                    rng=rng,
+                    lifecycle_start=batch_start,
+                    sampler=sampler,
+                    uniforms=uniforms,
+                )
+            else:
+                # Full simulation using calibrated lambda
+                parts: list[lcgen.results.LifecycleEvents] = []
+                for lc in range(batch_start, batch_start + n_batch):
+                    df = lcgen.sampling.simulate_lifecycle(
+                        lifecycle_index=lc,
+                        init_year=INITIALIZE_YEAR,
+                        duration_years=LIFECYCLE_DURATION,
+                        lam=lam,
+                        min_sep_days=MIN_ARRIVAL_TROP_DAYS,
+                        prob_schedule=prob_schedule,
+                        storm_set=storm_set,
+                        show_progress=False,
+                        rng=rng,
+                        sampler=sampler,
+                    )
+                    # Keep only the typed ID / timing columns
+                    parts.append(
+                        lcgen.results.LifecycleEvents.from_frame(df, INITIALIZE_YEAR)
+                    )
+                events = lcgen.results.LifecycleEvents.concat(parts)
+
+            # Columns for outputs: lcgen.results.OUTPUT_COLUMNS
+            writer.write(events)
+
+            if VALIDATE_LAMBDA or ADAPTIVE:
+                # validation targets the tropical family only
+                trop = events if families is None else events.select(events.storm_type == 0)
+                validation.update(trop, batch_start, n_batch)
 
-        # Keep only the ID / timing columns for outputs
-        df_ids = df[cols].copy()
-        all_dfs.append(df_ids)
+            if ADAPTIVE:
+                print(
+                    f"{validation.n_lifecycles} lifecycles: mean {validation.mean:.4f}"
+                    f" (SE {validation.mean_se:.4f}),"
+                    f" storm TV {validation.storm_frequency_error():.4f}"
+                )
+                if validation.converged(TOL_MEAN_SE, TOL_STORM_ERROR):
+                    print(f"Converged after {validation.n_lifecycles} lifecycles")
+                    break
 
-    data = pd.concat(all_dfs, ignore_index=True)
-    data.to_csv(OUTPUT_DIRECTORY / f"EventDate_LC.csv", index=False)
+            if checkpoint is not None:
+                position = writer.checkpoint(batch_start + n_batch)
+                if position is not None:
+                    checkpoint.save(
+                        {
+                            "next_lifecycle": batch_start + n_batch,
+                            "rng": rng.bit_generator.state,
+                            "seed": seed,
+                            "uniforms": uniforms,
+                            "validation": validation,
+                            "writer": position,
+                        }
+                    )
+        else:
+            if ADAPTIVE:
+                print(f"[warn] Tolerances not met within NUM_LCS={NUM_LCS} lifecycles.")
+
+    if checkpoint is not None:
+        checkpoint.clear()
 
     if VALIDATE_LAMBDA:
-        # Concatenate all lifecycles for validation (use in-memory frames)
-        if all_dfs:
-            df_all = pd.concat(all_dfs, ignore_index=True)
-            counts = lcgen.validation.compute_storm_counts(df_all)
-            lcgen.validation.verify_lambda(counts, LAM_TARGET)
+        if validation.n_lifecycles:
+            validation.report()
         else:
             print("[warn] No lifecycle data generated; skipping lambda validation.")
 
 
+def check_config() -> None:
+    """
+    Reject settings that would only fail partway through a run, before any
+    output is written.
+    """
+    if ENSEMBLE == "antithetic" and (LCS_PER_BATCH % 2 or NUM_LCS % 2):
+        # every batch must start at an even lifecycle and hold whole pairs
+        raise ValueError(
+            "ENSEMBLE = 'antithetic' needs an even LCS_PER_BATCH and NUM_LCS,"
+            f" got {LCS_PER_BATCH} and {NUM_LCS}"
+        )
+
+
+def tropical_inputs(storm_set: pd.DataFrame) -> tuple[float, pd.DataFrame]:
+    """
+    Rate and storm set of the tropical family: LAM_TARGET and the catalog,
+    or the INTENSITY_BUCKETS rates and members, with the IMPORTANCE_SAMPLING
+    proposal added when enabled.
+    """
+    lam = LAM_TARGET
+    if INTENSITY_BUCKETS:
+        buckets = lcgen.load.load_intensity_buckets(BUCKET_FILE)
+        lam, storm_set = lcgen.samplers.intensity_storm_set(storm_set, buckets)
+        print(f"Intensity-bucketed rate: {lam:.4f} storms/year")
+    if IMPORTANCE_SAMPLING:
+        storm_set = lcgen.samplers.importance_storm_set(
+            storm_set, IS_DP_EDGES, IS_BUCKET_SHARE
+        )
+    return lam, storm_set
+
+
+def _run_config() -> dict:
+    """
+    Settings that shape the output; a checkpoint only resumes an identical run.
+    """
+    ignored = {"PROFILE", "WORKERS", "CHECKPOINT_FILE", "CACHE_DIRECTORY"}
+    return {
+        name: value
+        for name, value in globals().items()
+        if name.isupper()
+        and name not in ignored
+        and isinstance(value, (bool, int, float, str, tuple, Path, type(None)))
+    }
+
+
+def run_save_points(prob_schedule: pd.DataFrame, storm_set: pd.DataFrame):
+    """
+    Lifecycles for every save point in SAVE_POINTS_FILE from one shared
+    schedule and catalog, written to OUTPUT_DIRECTORY/sp_<id>/.
+    """
+    if IMPORTANCE_SAMPLING or JOINT_EXTRA or ADAPTIVE or ENSEMBLE != "mc":
+        raise ValueError(
+            "SAVE_POINTS_FILE runs plain Monte Carlo only (no IMPORTANCE_SAMPLING,"
+            " JOINT_EXTRA, ADAPTIVE or ENSEMBLE)"
+        )
+    if CHECKPOINT_FILE is not None:
+        raise ValueError(
+            "SAVE_POINTS_FILE runs are not checkpointed; set CHECKPOINT_FILE = None"
+        )
+    save_points = lcgen.parallel.save_points_from_buckets(
+        lcgen.load.load_intensity_buckets(SAVE_POINTS_FILE)
+    )
+    seed = lcgen.streams.new_master_seed() if SEED is None else SEED
+    print(f"Master seed: {seed}, {len(save_points)} save points")
+
+    writer, current = None, None
+    try:
+        for sp, events in lcgen.parallel.simulate_save_points(
+            save_points,
+            n_lifecycles=NUM_LCS,
+            init_year=INITIALIZE_YEAR,
+            duration_years=LIFECYCLE_DURATION,
+            min_sep_days=MIN_ARRIVAL_TROP_DAYS,
+            prob_schedule=prob_schedule,
+            storm_set=storm_set,
+            seed=seed,
+            workers=WORKERS if PARALLEL else 1,
+            lcs_per_batch=LCS_PER_BATCH,
+            bit_generator=BIT_GENERATOR,
+        ):
+            if sp is not current:
+                if writer is not None:
+                    writer.close()
+                writer = lcgen.output.event_writer(
+                    lcgen.output.save_point_directory(OUTPUT_DIRECTORY, sp.save_point),
+                    OUTPUT_FORMAT,
+                )
+                current = sp
+            writer.write(events)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
 if __name__ == "__main__":
     if PROFILE:
         import cProfile
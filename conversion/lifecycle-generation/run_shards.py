@@ -0,0 +1,155 @@
+# conversion/lifecycle-generation/run_shards.py
+"""
+Sharded multi-node lifecycle generation with a merge step.
+
+Uses the inputs and run settings of main.py. Every node runs one shard with
+the same --seed; once all shards are finished, one merge combines them:
+
+    python lifecycle-generation/run_shards.py run --shard 0 --shards 8 --seed 123
+    ...
+    python lifecycle-generation/run_shards.py run --shard 7 --shards 8 --seed 123
+    python lifecycle-generation/run_shards.py merge
+
+'local' runs all shards on this machine, one process each, then merges:
+
+    python lifecycle-generation/run_shards.py local --shards 4 --seed 123
+
+Run from conversion/ like main.py. The merged output equals a single-node
+PARALLEL run of main.py with the same seed and BIT_GENERATOR, including
+INTENSITY_BUCKETS and IMPORTANCE_SAMPLING. JOINT_EXTRA, ADAPTIVE, ENSEMBLE
+schemes and SAVE_POINTS_FILE are rejected.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import lcgen
+import main as config
+
+SHARD_DIRECTORY = config.OUTPUT_DIRECTORY / "shards"
+
+
+def shard_inputs() -> dict:
+    """
+    run_shard keyword arguments shared by every shard, from main.py.
+
+    INTENSITY_BUCKETS and IMPORTANCE_SAMPLING carry over as in main.py;
+    settings a shard cannot reproduce raise ValueError before anything is
+    written.
+    """
+    unsupported = [
+        name
+        for name, active in [
+            ("JOINT_EXTRA", config.JOINT_EXTRA),
+            ("ADAPTIVE", config.ADAPTIVE),
+            ("ENSEMBLE", config.ENSEMBLE != "mc"),
+            ("SAVE_POINTS_FILE", config.SAVE_POINTS_FILE is not None),
+        ]
+        if active
+    ]
+    if unsupported:
+        raise ValueError(
+            f"sharded runs do not support {', '.join(unsupported)}; disable them in main.py"
+        )
+    prob_schedule = lcgen.load.load_relative_probabilities(
+        config.REL_PROB_FILE, cache_dir=config.CACHE_DIRECTORY
+    )
+    storm_set = lcgen.load.load_storm_id_cdf(
+        config.STORM_ID_PROB_FILE, cache_dir=config.CACHE_DIRECTORY
+    )
+    lam, storm_set = config.tropical_inputs(storm_set)
+    # recorded in every manifest; merge refuses shards that disagree
+    sources = {
+        "REL_PROB_FILE": config.REL_PROB_FILE,
+        "STORM_ID_PROB_FILE": config.STORM_ID_PROB_FILE,
+    }
+    if config.INTENSITY_BUCKETS:
+        sources["BUCKET_FILE"] = config.BUCKET_FILE
+    settings = dict(
+        importance_sampling=config.IMPORTANCE_SAMPLING,
+        is_dp_edges=list(config.IS_DP_EDGES) if config.IMPORTANCE_SAMPLING else None,
+        is_bucket_share=(
+            list(config.IS_BUCKET_SHARE)
+            if config.IMPORTANCE_SAMPLING and config.IS_BUCKET_SHARE is not None
+            else None
+        ),
+        intensity_buckets=config.INTENSITY_BUCKETS,
+        sources={name: lcgen.load.file_digest(path) for name, path in sources.items()},
+    )
+    return dict(
+        n_lifecycles=config.NUM_LCS,
+        init_year=config.INITIALIZE_YEAR,
+        duration_years=config.LIFECYCLE_DURATION,
+        lam=lam,
+        min_sep_days=config.MIN_ARRIVAL_TROP_DAYS,
+        prob_schedule=prob_schedule,
+        storm_set=storm_set,
+        lcs_per_batch=config.LCS_PER_BATCH,
+        bit_generator=config.BIT_GENERATOR,
+        output_format=config.OUTPUT_FORMAT,
+        settings=settings,
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--directory", type=Path, default=SHARD_DIRECTORY)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="generate one shard on this node")
+    run.add_argument("--shard", type=int, required=True, help="shard index, from 0")
+    run.add_argument("--shards", type=int, required=True, help="total number of shards")
+    run.add_argument("--seed", type=int, required=True, help="master seed, same on every node")
+    run.add_argument("--workers", type=int, default=None, help="process pool size on this node")
+
+    local = commands.add_parser("local", help="run all shards locally, then merge")
+    local.add_argument("--shards", type=int, required=True)
+    local.add_argument("--seed", type=int, required=True)
+
+    commands.add_parser("merge", help="check finished shards and merge them")
+    args = parser.parse_args(argv)
+
+    if args.command in ("run", "local"):
+        try:
+            inputs = shard_inputs()
+        except ValueError as err:
+            print(f"[error] {err}")
+            return 1
+
+    if args.command == "run":
+        manifest = lcgen.shards.run_shard(
+            args.directory,
+            args.shard,
+            args.shards,
+            seed=args.seed,
+            workers=args.workers,
+            **inputs,
+        )
+        print(
+            f"Shard {args.shard}/{args.shards}: lifecycles"
+            f" [{manifest['lifecycle_start']}, {manifest['lifecycle_stop']}),"
+            f" {manifest['n_events']} events"
+        )
+        return 0
+
+    if args.command == "local":
+        lcgen.shards.run_shards_locally(
+            args.directory, args.shards, seed=args.seed, **inputs
+        )
+
+    try:
+        summary = lcgen.shards.merge_shards(
+            args.directory, config.OUTPUT_DIRECTORY, config.OUTPUT_FORMAT
+        )
+    except ValueError as err:
+        print(f"[error] {err}")
+        return 1
+    print(
+        f"Merged {summary['n_shards']} shards: {summary['n_lifecycles']} lifecycles,"
+        f" {summary['n_events']} events (seed {summary['seed']})"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,12 @@
 import numpy as np
 import h5py
 from scipy.io import loadmat
+from scipy.spatial import cKDTree
 from pathlib import Path
 import pandas as pd
 
+import lcgen
+
 BASE_INPUT_DIR = Path("../data/raw/conversion-lifecycle-generation/CHS_Files")
 INPUT_MAT_FILES = [
     "CHS-NA_nodeID_v4.mat",
@@ -16,67 +19,213 @@ INPUT_MAT_FILES = [
     "CHS-NA_ITCS_DSW_600km.mat",
 ]
 OUTPUT_PATH = Path("../data/intermediate/conversion-lifecycle-generation/stormprob.csv")
+BUCKET_OUTPUT_PATH = Path(
+    "../data/intermediate/conversion-lifecycle-generation/intensity_buckets.csv"
+)
+SAVE_POINT_OUTPUT_PATH = Path(
+    "../data/intermediate/conversion-lifecycle-generation/save_points.csv"
+)
 EARTH_RADIUS_KM = 6371.0
 
+CHS_REGION = "CHS-NA"
+TRK_DIST_KM = 200.0  # radius of influence for storm tracks (intensity bucket population)
+SAVE_POINT_IDS = [133]  # node IDs (FROM ADCIRC H5 FILE), list or range; None = all
+CHUNK_SIZE = 1000  # save points per vectorized batch
+INTENSITY_BUCKETS = ["LI", "MI", "HI"]
+CACHE_DIRECTORY = Path(  # parsed MAT variables, keyed by file hash; None disables
+    "../data/intermediate/conversion-lifecycle-generation/.lcgen-cache"
+)
+
 
-def extract_mat_struct(filename: str) -> dict[str, pd.DataFrame]:
+def extract_mat_struct(filename: str, cache_dir=None) -> dict[str, pd.DataFrame]:
     """
     Load a MATLAB .mat file and return a dict mapping variable names
     to pandas DataFrames with generic 'Col0', 'Col1', ... column names.
 
     Supports both classic MAT files and v7.3 (HDF5) via h5py fallback.
+    With 'cache_dir', the parsed variables are kept there as memory-mapped
+    arrays keyed by the file's content hash (see lcgen.load.cached_arrays),
+    so later runs and parallel workers open them without parsing.
+    """
+    print(filename)
+    if cache_dir is None:
+        arrays = _read_mat_arrays(filename)
+    else:
+        arrays = lcgen.load.cached_arrays(_read_mat_arrays, filename, cache_dir)
+
+    return {
+        name: pd.DataFrame(
+            arr, columns=[f"Col{i}" for i in range(arr.shape[1])], copy=False
+        )
+        for name, arr in arrays.items()
+    }
+
+
+def _read_mat_arrays(filename: str) -> dict[str, np.ndarray]:
+    """
+    Every variable of a MAT file as a 2D (n, m) array.
     """
     try:
-        print(filename)
         raw = loadmat(filename, struct_as_record=False, squeeze_me=True)
         var_list = [
             key
             for key in raw.keys()
             if not (key.startswith("__") and key.endswith("__"))
         ]
+        return {vv: _as_2d(raw[vv]) for vv in var_list}
 
-        mat_struct: dict[str, pd.DataFrame] = {}
+    except NotImplementedError:
+        # Likely a v7.3 MAT file (HDF5)
+        with h5py.File(filename, "r") as f:
+            return {ds: _as_2d(f[ds][()]) for ds in list(f.keys())}
 
-        for vv in var_list:
-            val = raw[vv]
 
-            # Convert to ndarray and standardize shape: 2D (n, m)
-            arr = np.asarray(val)
-            if arr.ndim == 0:
-                # scalar
-                arr = arr.reshape(1, 1)
-            elif arr.ndim == 1:
-                # vector
-                arr = arr.reshape(-1, 1)
-            elif arr.ndim > 2:
-                # collapse higher dims to 2D
-                arr = arr.reshape(arr.shape[0], -1)
+def _as_2d(val) -> np.ndarray:
+    # Convert to ndarray and standardize shape: 2D (n, m)
+    arr = np.asarray(val)
+    if arr.ndim == 0:
+        # scalar
+        arr = arr.reshape(1, 1)
+    elif arr.ndim == 1:
+        # vector
+        arr = arr.reshape(-1, 1)
+    elif arr.ndim > 2:
+        # collapse higher dims to 2D
+        arr = arr.reshape(arr.shape[0], -1)
+    return arr
 
-            n_cols = arr.shape[1]
-            columns = [f"Col{i}" for i in range(n_cols)]
-            mat_struct[vv] = pd.DataFrame(arr, columns=columns)
 
-        return mat_struct
+class MatVariable:
+    """
+    Lazy handle on one MAT variable, in the 2D (n, m) layout of
+    extract_mat_struct (ColN is column N).
 
-    except NotImplementedError:
-        # Likely a v7.3 MAT file (HDF5)
-        result: dict[str, pd.DataFrame] = {}
-        with h5py.File(filename, "r") as f:
-            for ds in list(f.keys()):
-                arr = f[ds][()]
-                arr = np.asarray(arr)
-                if arr.ndim == 0:
-                    arr = arr.reshape(1, 1)
-                elif arr.ndim == 1:
-                    arr = arr.reshape(-1, 1)
-                elif arr.ndim > 2:
-                    arr = arr.reshape(arr.shape[0], -1)
+    Backed by an h5py dataset for v7.3 files, so only the requested rows
+    and columns are read (HDF5 hyperslabs), or by a memory-mapped or
+    in-memory array otherwise.
+    """
+
+    def __init__(self, name: str, data):
+        self.name = name
+        self.data = data
+        shape = tuple(data.shape)
+        if len(shape) == 0:
+            self.shape = (1, 1)
+        elif len(shape) == 1:
+            self.shape = (shape[0], 1)
+        else:
+            self.shape = (shape[0], int(np.prod(shape[1:])))
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.data.dtype
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __repr__(self) -> str:
+        return f"MatVariable({self.name!r}, shape={self.shape}, dtype={self.dtype})"
+
+    def read(self, rows=None, columns=None) -> np.ndarray:
+        """
+        2D array of 'rows' × 'columns' (each None for all, a slice, an int
+        or a sequence of indices in any order).
+        """
+        if len(self.data.shape) == 0:
+            return _as_2d(self.data[()])[_index(rows, 1)][:, _index(columns, 1)]
+        row_sel, row_order = _hyperslab(rows, self.shape[0])
+        if len(self.data.shape) == 2:
+            col_sel, col_order = _hyperslab(columns, self.shape[1])
+            if isinstance(row_sel, slice) or isinstance(col_sel, slice):
+                arr = self.data[row_sel, col_sel]
+            else:
+                # HDF5 takes one index list per read
+                arr = self.data[row_sel][:, col_sel]
+            return np.asarray(arr)[row_order][:, col_order]
+        # vectors and higher-rank arrays: select rows, then columns in memory
+        arr = np.asarray(self.data[row_sel])
+        arr = arr.reshape(arr.shape[0], -1)
+        return arr[row_order][:, _index(columns, self.shape[1])]
+
+    def column(self, i: int, rows=None) -> np.ndarray:
+        """
+        Column i (ColN) as a 1D array, optionally only 'rows'.
+        """
+        return self.read(rows, [i])[:, 0]
+
+    def frame(self, rows=None, columns=None) -> pd.DataFrame:
+        """
+        read() as a DataFrame with the ColN names of extract_mat_struct.
+        """
+        cols = np.arange(self.shape[1])[_index(columns, self.shape[1])]
+        return pd.DataFrame(
+            self.read(rows, columns), columns=[f"Col{i}" for i in np.atleast_1d(cols)]
+        )
+
+
+class MatFile:
+    """
+    Variables of a MAT file as MatVariable handles, opened without reading
+    any data. Use as a context manager; v7.3 handles read from the open file.
+    """
+
+    def __init__(self, filename, cache_dir=None):
+        self.filename = filename
+        self._h5 = None
+        if cache_dir is not None:
+            arrays = lcgen.load.cached_arrays(_read_mat_arrays, filename, cache_dir)
+        elif h5py.is_hdf5(filename):
+            self._h5 = h5py.File(filename, "r")
+            arrays = {
+                name: ds
+                for name, ds in self._h5.items()
+                if isinstance(ds, h5py.Dataset)
+            }
+        else:
+            arrays = _read_mat_arrays(filename)
+        self.variables = {name: MatVariable(name, a) for name, a in arrays.items()}
+
+    def __getitem__(self, name: str) -> MatVariable:
+        return self.variables[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.variables
+
+    def keys(self):
+        return self.variables.keys()
 
-                n_cols = arr.shape[1]
-                columns = [f"Col{i}" for i in range(n_cols)]
-                result[ds] = pd.DataFrame(arr, columns=columns)
+    def close(self) -> None:
+        if self._h5 is not None:
+            self._h5.close()
+            self._h5 = None
 
-        return result
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _index(sel, n: int):
+    if sel is None:
+        return slice(None)
+    if isinstance(sel, slice):
+        return sel
+    return np.atleast_1d(np.arange(n)[np.asarray(sel, dtype=np.int64)])
+
+
+def _hyperslab(sel, n: int):
+    """
+    HDF5-readable selection for 'sel' (a slice, or sorted unique indices)
+    and the reordering that turns what it reads back into 'sel'.
+    """
+    if sel is None or isinstance(sel, slice):
+        return (slice(None) if sel is None else sel), slice(None)
+    index = np.atleast_1d(np.arange(n)[np.asarray(sel, dtype=np.int64)])
+    unique, order = np.unique(index, return_inverse=True)
+    if unique.size and unique[-1] - unique[0] + 1 == unique.size:
+        return slice(int(unique[0]), int(unique[-1]) + 1), order
+    return unique, order
 
 
 def find_nearest_latlon(
@@ -150,117 +299,288 @@ def find_nearest_latlon(
     return nearest_lat, nearest_lon, within_radius, distance_km, min_index
 
 
-def main():
-    ## LOAD MAT FILES FROM CHS
-    mat_files = INPUT_MAT_FILES
-    base_dir = BASE_INPUT_DIR
-    files_to_load = [base_dir / f for f in mat_files]
+class GeoIndex:
+    """
+    Spatial index over fixed (lat, lon) points, e.g. the CRL or master-track
+    table, built once and queried for whole batches of targets.
 
-    # Define CHS-Region
-    chs_region = "CHS-NA"
+    Points are stored as unit vectors in a KD-tree; the straight-line
+    (chord) distance between unit vectors is monotone in great-circle
+    distance, so nearest-k and radius queries are exact and distances are
+    returned in km, equal to the haversine distances of find_nearest_latlon.
+    """
 
-    # Define Radius Of Influence For Storm Tracks (Intensity Bucket Population)
-    trk_dist_km = 200.0
+    def __init__(self, latitudes: np.ndarray, longitudes: np.ndarray):
+        self.latitudes = np.asarray(latitudes, dtype=float)
+        self.longitudes = np.asarray(longitudes, dtype=float)
+        self.tree = cKDTree(_unit_vectors(self.latitudes, self.longitudes))
+
+    def __len__(self) -> int:
+        return self.latitudes.size
+
+    def nearest(
+        self, target_lat, target_lon, k: int = 1
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        The k nearest points of every target.
+
+        Returns
+        -------
+        distance_km : np.ndarray, shape (n_targets,) for k=1, else (n_targets, k)
+        index       : np.ndarray, same shape, row numbers into the indexed table
+        """
+        chord, index = self.tree.query(_unit_vectors(target_lat, target_lon), k=k)
+        return _chord_to_km(chord), index
+
+    def within(self, target_lat, target_lon, radius_km: float) -> list[np.ndarray]:
+        """
+        Sorted row numbers of the points within radius_km of each target.
+        """
+        chord = 2.0 * np.sin(min(radius_km / EARTH_RADIUS_KM, np.pi) / 2.0)
+        hits = self.tree.query_ball_point(
+            _unit_vectors(target_lat, target_lon), r=chord, return_sorted=True
+        )
+        return [np.asarray(h, dtype=np.int64) for h in hits]
+
+    def distance_km(self, target_lat: float, target_lon: float, index=None) -> np.ndarray:
+        """
+        Great-circle distance from one target to the points 'index' (default all).
+        """
+        points = self.tree.data if index is None else self.tree.data[index]
+        chord = np.linalg.norm(points - _unit_vectors(target_lat, target_lon)[0], axis=1)
+        return _chord_to_km(chord)
+
+
+def _unit_vectors(lat, lon) -> np.ndarray:
+    lat = np.deg2rad(np.atleast_1d(np.asarray(lat, dtype=float)).ravel())
+    lon = np.deg2rad(np.atleast_1d(np.asarray(lon, dtype=float)).ravel())
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def _chord_to_km(chord: np.ndarray) -> np.ndarray:
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord) / 2.0, 0.0, 1.0))
+
+
+def load_chs_tables(files_to_load, cache_dir=None) -> dict[str, pd.DataFrame]:
+    """
+    Read the eight CHS tables once: grid, CRLs, SRR (All, HI, LI, MI),
+    master track table and DSW, in INPUT_MAT_FILES order.
 
-    ## DEFINE CHS-NA EXCEPTION (storms rate scaling factor)
-    if "CHS-NA" in chs_region:
-        srr_to_stmperyr = 400.0
-    else:
-        srr_to_stmperyr = 600.0
-
-    ## BUILD DICTIONARIES
-    grid = extract_mat_struct(files_to_load[0])  # Grid File
-    CRL = extract_mat_struct(files_to_load[1])  # Coastal Reference Locations
-    SRR_All = extract_mat_struct(files_to_load[2])  # SRR Total
-    SRR_HI = extract_mat_struct(files_to_load[3])  # SRR High Intensity
-    SRR_LI = extract_mat_struct(files_to_load[4])  # SRR Low Intensity
-    SRR_MI = extract_mat_struct(files_to_load[5])  # SRR Mid Intensity
-    MasterTrack = extract_mat_struct(files_to_load[6])  # Master Track Table
-    DSW = extract_mat_struct(files_to_load[7])  # Prob Mass
-
-    ## FIND NEAREST CRL TO FIND ASSOCIATED SRR
-    sp_id = 133  # FROM ADCIRC H5 FILE
-
-    # Build arrays from CRL dictionary
-    crl_lat = CRL["CRL"]["Col1"].values
-    crl_lon = CRL["CRL"]["Col0"].values
-
-    # Get SP Lat, Lon
-    if "nodeID" in grid:
-        sp_mask = grid["nodeID"]["Col0"] == sp_id
-        sp_lat = grid["nodeID"].loc[sp_mask, "Col2"].values
-        sp_lon = grid["nodeID"].loc[sp_mask, "Col3"].values
-    else:
-        sp_mask = grid["staID"]["Col0"] == sp_id
-        sp_lat = grid["staID"].loc[sp_mask, "Col1"].values
-        sp_lon = grid["staID"].loc[sp_mask, "Col2"].values
+    Only the columns used below are read: v7.3 files through HDF5 slices,
+    cached files through their memory maps.
+    """
+    with (
+        MatFile(files_to_load[0], cache_dir) as grid,  # Grid File
+        MatFile(files_to_load[1], cache_dir) as CRL,  # Coastal Reference Locations
+        MatFile(files_to_load[2], cache_dir) as SRR_All,  # SRR Total
+        MatFile(files_to_load[3], cache_dir) as SRR_HI,  # SRR High Intensity
+        MatFile(files_to_load[4], cache_dir) as SRR_LI,  # SRR Low Intensity
+        MatFile(files_to_load[5], cache_dir) as SRR_MI,  # SRR Mid Intensity
+        MatFile(files_to_load[6], cache_dir) as MasterTrack,  # Master Track Table
+        MatFile(files_to_load[7], cache_dir) as DSW,  # Prob Mass
+    ):
+        # Save point locations (node or station IDs)
+        if "nodeID" in grid:
+            nodes = grid["nodeID"].read(columns=[0, 2, 3])
+        else:
+            nodes = grid["staID"].read(columns=[0, 1, 2])
+        nodes = pd.DataFrame(
+            nodes, columns=["save_point", "lat", "lon"]
+        ).astype({"save_point": int})
+
+        return {
+            "nodes": nodes.drop_duplicates("save_point").set_index("save_point"),
+            "crl": CRL["CRL"].frame(columns=[0, 1]),
+            "srr": pd.DataFrame(
+                {
+                    "LI": SRR_LI["SRR"].column(0),
+                    "MI": SRR_MI["SRR"].column(0),
+                    "HI": SRR_HI["SRR"].column(0),
+                    "All": SRR_All["SRR"].column(0),
+                },
+                dtype=float,
+            ),
+            "tracks": MasterTrack["Param_ITCS"].frame(),
+            "dsw": DSW["DSW_ITCS"].column(0).astype(float),
+        }
+
+
+def intensity_bucket_codes(dp: np.ndarray, chs_region: str) -> np.ndarray:
+    """
+    Bucket of every storm by central pressure deficit dP: 0 = LI, 1 = MI,
+    2 = HI (INTENSITY_BUCKETS order). NACCS defines no MI bucket.
+    """
+    dp = np.asarray(dp, dtype=float)
+    if "NACCS" in chs_region:
+        # NACCS thresholds
+        return np.where(dp < 48, 0, 2)
+    # CHS thresholds
+    return np.where(dp < 28, 0, np.where(dp < 48, 1, 2))
+
+
+def extract_save_points(
+    tables: dict,
+    save_points,
+    chs_region: str,
+    trk_dist_km: float,
+    chunk_size: int = 1000,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Nearest-CRL SRRs and intensity bucket populations for many save points.
 
-    if sp_lat.size == 0:
-        raise ValueError(f"sp_id {sp_id} not found in grid file")
+    The CRL and master track indices are built once; save points are then
+    processed chunk_size at a time with batched KD-tree queries.
 
-    # Find distance between CRLs and SP location
-    nearest_lat, nearest_lon, _, distance_km, min_indx = find_nearest_latlon(
-        sp_lat, sp_lon, crl_lat, crl_lon, max_radius_km=None
+    Returns
+    -------
+    summary : pd.DataFrame indexed by save_point — location, nearest CRL
+        (row and distance), SRR per bucket and in total [storms/year],
+        and member count and summed DSW per bucket
+    buckets : pd.DataFrame — one row per (save_point, member storm) with
+        bucket, bucket rate [storms/year], storm_ID and DSW, plus one row
+        without storm_ID per bucket with a rate but no members; the
+        intensity_buckets.csv layout read by lcgen.load.load_intensity_buckets
+    """
+    ## DEFINE CHS-NA EXCEPTION (storms rate scaling factor)
+    srr_to_stmperyr = 400.0 if "CHS-NA" in chs_region else 600.0
+
+    save_points = np.asarray(list(save_points), dtype=np.int64)
+    missing = save_points[~np.isin(save_points, tables["nodes"].index.values)]
+    if missing.size:
+        raise ValueError(f"save points {missing.tolist()} not found in grid file")
+    locations = tables["nodes"].loc[save_points]
+
+    crl_index = GeoIndex(tables["crl"]["Col1"].values, tables["crl"]["Col0"].values)
+    tracks = tables["tracks"]
+    track_index = GeoIndex(tracks["Col3"].values, tracks["Col4"].values)
+    track_bucket = intensity_bucket_codes(tracks["Col6"].values, chs_region)
+    track_storm_id = tracks["Col0"].values.astype(np.int64)
+    track_dsw = tables["dsw"]
+    srr = tables["srr"][INTENSITY_BUCKETS + ["All"]].values * srr_to_stmperyr
+
+    summaries, members = [], []
+    for start in range(0, save_points.size, chunk_size):
+        sp = save_points[start : start + chunk_size]
+        lat = locations["lat"].values[start : start + chunk_size]
+        lon = locations["lon"].values[start : start + chunk_size]
+
+        # Nearest CRL to every SP → SRRs in [storms/year]
+        crl_dist, crl_row = crl_index.nearest(lat, lon)
+        sp_srr = srr[crl_row]
+
+        # Storms whose track reference location lies within trk_dist_km of each SP
+        hits = track_index.within(lat, lon, trk_dist_km)
+        owner = np.repeat(np.arange(sp.size), [h.size for h in hits])
+        rows = np.concatenate(hits) if hits else np.empty(0, dtype=np.int64)
+        bucket = track_bucket[rows]
+        order = np.lexsort((bucket, owner))  # by SP, then LI/MI/HI, then track row
+        owner, rows, bucket = owner[order], rows[order], bucket[order]
+
+        n_buckets = len(INTENSITY_BUCKETS)
+        counts = np.zeros((sp.size, n_buckets), dtype=np.int64)
+        np.add.at(counts, (owner, bucket), 1)
+        dsw_sums = np.zeros((sp.size, n_buckets))
+        np.add.at(dsw_sums, (owner, bucket), track_dsw[rows])
+
+        summary = pd.DataFrame(
+            {
+                "save_point": sp,
+                "lat": lat,
+                "lon": lon,
+                "crl_index": crl_row,
+                "crl_distance_km": crl_dist,
+            }
+        )
+        for j, name in enumerate(INTENSITY_BUCKETS + ["All"]):
+            summary[f"srr_{name}"] = sp_srr[:, j]
+        for j, name in enumerate(INTENSITY_BUCKETS):
+            summary[f"n_{name}"] = counts[:, j]
+        for j, name in enumerate(INTENSITY_BUCKETS):
+            summary[f"dsw_{name}"] = dsw_sums[:, j]
+        summaries.append(summary)
+
+        members.append(
+            pd.DataFrame(
+                {
+                    "save_point": sp[owner],
+                    "bucket": np.asarray(INTENSITY_BUCKETS)[bucket],
+                    "rate": sp_srr[owner, bucket],
+                    "storm_ID": pd.array(track_storm_id[rows], dtype="Int64"),
+                    "DSW": track_dsw[rows],
+                }
+            )
+        )
+        # a bucket with a rate but no member storms keeps one row without
+        # storm_ID, so its rate is not lost (lcgen rejects such buckets)
+        empty_sp, empty_bucket = np.nonzero((counts == 0) & (sp_srr[:, :n_buckets] > 0))
+        members.append(
+            pd.DataFrame(
+                {
+                    "save_point": sp[empty_sp],
+                    "bucket": np.asarray(INTENSITY_BUCKETS)[empty_bucket],
+                    "rate": sp_srr[empty_sp, empty_bucket],
+                    "storm_ID": pd.array([pd.NA] * empty_sp.size, dtype="Int64"),
+                    "DSW": np.nan,
+                }
+            )
+        )
+
+    return (
+        pd.concat(summaries, ignore_index=True).set_index("save_point"),
+        pd.concat(members, ignore_index=True).sort_values(
+            "save_point", kind="stable", ignore_index=True
+        ),
     )
 
-    # Pull SRRs associated to SP and convert to [storms/year]
-    # NOTE: convert to np.array BEFORE multiplying to avoid list repetition
-    srr_vals = np.array(
-        [
-            SRR_LI["SRR"]["Col0"].iloc[min_indx],
-            SRR_MI["SRR"]["Col0"].iloc[min_indx],
-            SRR_HI["SRR"]["Col0"].iloc[min_indx],
-            SRR_All["SRR"]["Col0"].iloc[min_indx],
-        ],
-        dtype=float,
-    )
-    SSR_SP = srr_vals * srr_to_stmperyr
 
-    print("SSR_SP [LI, MI, HI, All] (storms/year):", SSR_SP)
+def main():
+    ## LOAD MAT FILES FROM CHS (once for all save points)
+    mat_files = INPUT_MAT_FILES
+    base_dir = BASE_INPUT_DIR
+    files_to_load = [base_dir / f for f in mat_files]
+    tables = load_chs_tables(files_to_load, cache_dir=CACHE_DIRECTORY)
 
     ## LOAD PROB MASS
-    TC_Freq = DSW["DSW_ITCS"]["Col0"].values
-    TotalFreq = float(TC_Freq.sum())
+    TotalFreq = float(tables["dsw"].sum())
     print("Total TC frequency (sum of DSW):", TotalFreq)
 
-    ## FIND INFLUENTIAL STORMS AND POPULATE INTENSITY BUCKETS
-    # Grab Lat/Lon from Master Track Table
-    track_lat = MasterTrack["Param_ITCS"]["Col3"].values
-    track_lon = MasterTrack["Param_ITCS"]["Col4"].values
-
-    # Find distance between track reference location & SP location
-    _, _, _, track_dist_km, _ = find_nearest_latlon(
-        sp_lat, sp_lon, track_lat, track_lon, max_radius_km=None
+    ## NEAREST-CRL SRRs + INTENSITY BUCKETS FOR EVERY SAVE POINT
+    save_points = tables["nodes"].index if SAVE_POINT_IDS is None else SAVE_POINT_IDS
+    summary, buckets = extract_save_points(
+        tables, save_points, CHS_REGION, TRK_DIST_KM, chunk_size=CHUNK_SIZE
     )
 
-    # Create mask for storms within trk_dist_km radius
-    dist_mask = track_dist_km <= trk_dist_km
-
-    # Only keep events that fall within the radius from SP
-    reduced_set = MasterTrack["Param_ITCS"].loc[dist_mask].copy()
-
-    if "NACCS" in chs_region:
-        # NACCS thresholds
-        LI_pop = reduced_set.loc[reduced_set["Col6"].values < 48, "Col0"].values
-        MI_pop = np.array([])  # No MI defined
-        HI_pop = reduced_set.loc[reduced_set["Col6"].values >= 48, "Col0"].values
+    if len(summary) == 1:
+        sp = summary.iloc[0]
+        print(
+            "SSR_SP [LI, MI, HI, All] (storms/year):",
+            sp[["srr_LI", "srr_MI", "srr_HI", "srr_All"]].values,
+        )
+        print(f"Low-intensity storms (ID count): {sp['n_LI']}")
+        print(f"Mid-intensity storms (ID count): {sp['n_MI']}")
+        print(f"High-intensity storms (ID count): {sp['n_HI']}")
     else:
-        # CHS thresholds
-        LI_pop = reduced_set.loc[reduced_set["Col6"].values < 28, "Col0"].values
-        MI_pop = reduced_set.loc[
-            (reduced_set["Col6"].values >= 28) & (reduced_set["Col6"].values < 48),
-            "Col0",
-        ].values
-        HI_pop = reduced_set.loc[reduced_set["Col6"].values >= 48, "Col0"].values
-
-    print(f"Low-intensity storms (ID count): {LI_pop.size}")
-    print(f"Mid-intensity storms (ID count): {MI_pop.size}")
-    print(f"High-intensity storms (ID count): {HI_pop.size}")
+        n_members = int(buckets["storm_ID"].notna().sum())
+        print(f"Extracted {len(summary)} save points, {n_members} bucket members")
+    n_empty = int(buckets["storm_ID"].isna().sum())
+    if n_empty:
+        print(
+            f"Warning: {n_empty} save point buckets have a rate but no member"
+            f" storms within {TRK_DIST_KM} km"
+        )
+
+    summary.to_csv(SAVE_POINT_OUTPUT_PATH)
+    print(f"Wrote save point SRR + bucket summary to {SAVE_POINT_OUTPUT_PATH.resolve()}")
+
+    ## BUCKET RATES + MEMBERS FOR lcgen (one row per save point and member storm)
+    buckets.to_csv(BUCKET_OUTPUT_PATH, index=False)
+    print(f"Wrote intensity bucket rates + members to {BUCKET_OUTPUT_PATH.resolve()}")
 
     print("Tada!")
 
     ## HAILIE ADDED: BUILD STORM ID + PROBABILITIES TABLE
-    SID = MasterTrack["Param_ITCS"].copy()
+    SID = tables["tracks"].copy()
     SID.columns = [
         "storm_ID",
         "Region_ID",
@@ -273,8 +593,7 @@ def main():
         "Translational_speed",
     ]
 
-    prob_dsw = DSW["DSW_ITCS"].copy()
-    prob_dsw.columns = ["DSW"]
+    prob_dsw = pd.DataFrame({"DSW": tables["dsw"]})
 
     SIDprob = pd.concat([SID, prob_dsw], axis=1)
 
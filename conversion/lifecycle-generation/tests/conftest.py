@@ -0,0 +1,6 @@
+# conversion/lifecycle-generation/tests/conftest.py
+import sys
+from pathlib import Path
+
+# lcgen is imported from the source tree, as main.py does
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
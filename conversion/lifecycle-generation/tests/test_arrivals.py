@@ -0,0 +1,42 @@
+# conversion/lifecycle-generation/tests/test_arrivals.py
+import numpy as np
+import pandas as pd
+
+import lcgen
+
+
+class _TopOfCellGenerator(np.random.Generator):
+    """
+    Generator whose uniforms are all the largest double below 1, so every
+    arrival lands at the very end of its cell (hour → 24).
+    """
+
+    def random(self, size=None, dtype=np.float64, out=None):
+        return np.full(size, np.nextafter(1.0, 0.0), dtype=dtype)
+
+
+def _schedule() -> pd.DataFrame:
+    doy = np.arange(1, 366)
+    month, day = lcgen.utils.doy_to_month_day(np.full(doy.size, 2033), doy)
+    return pd.DataFrame(
+        {
+            "month": month,
+            "day": day,
+            "trop_day_cdf": doy / doy.size,
+            "day_of_year": doy,
+        }
+    )
+
+
+def test_stored_hour_never_reaches_24():
+    rng = _TopOfCellGenerator(np.random.PCG64(0))
+    sampler = lcgen.arrivals.SeparatedArrivalSampler(_schedule(), min_sep_days=2.0)
+    doy, hour = sampler.sample(n_storms=3, size=4, rng=rng)
+    assert hour.max() > 23.99
+
+    stored = hour.astype(lcgen.results.EVENT_DTYPES["hour"])
+    assert (stored < 24.0).all()
+
+    year = np.full(doy.shape, 2033)
+    start = lcgen.utils.doy_to_datetime64(year, doy, stored)
+    assert (start.astype("datetime64[D]") == lcgen.utils.doy_to_datetime64(year, doy)).all()
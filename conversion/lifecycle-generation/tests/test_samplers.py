@@ -0,0 +1,43 @@
+# conversion/lifecycle-generation/tests/test_samplers.py
+import numpy as np
+import pandas as pd
+import pytest
+
+import lcgen
+
+
+def _storm_set() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "storm_id": np.arange(1, 7),
+            "dp": [10.0, 20.0, 30.0, 40.0, 50.0, 60.0],
+            "dsw": [1.0, 2.0, 1.0, 2.0, 1.0, 3.0],
+        }
+    )
+
+
+def _buckets(rows) -> pd.DataFrame:
+    df = pd.DataFrame(rows, columns=["bucket", "rate", "storm_id"])
+    return df.astype({"storm_id": "Int64"})
+
+
+def test_intensity_storm_set_mixes_bucket_rates():
+    buckets = _buckets(
+        [
+            ("LI", 2.0, 1),
+            ("LI", 2.0, 2),
+            ("HI", 0.5, 5),
+            ("HI", 0.5, 6),
+            ("MI", 0.0, None),
+        ]
+    )
+    lam, storm_set = lcgen.samplers.intensity_storm_set(_storm_set(), buckets)
+    assert lam == 2.5
+    prob = storm_set.groupby("bucket")["prob"].sum()
+    assert np.allclose(prob[["LI", "HI"]], [0.8, 0.2])
+
+
+def test_intensity_storm_set_rejects_rate_without_members():
+    buckets = _buckets([("LI", 2.0, 1), ("LI", 2.0, 2), ("HI", 0.5, None)])
+    with pytest.raises(ValueError, match="HI"):
+        lcgen.samplers.intensity_storm_set(_storm_set(), buckets)
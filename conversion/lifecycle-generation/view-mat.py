@@ -1,48 +1,125 @@
 from pathlib import Path
 
 from scipy.io import loadmat
+import h5py
 import numpy as np
 
 DATA_PATH = "/Users/rdcrltmn/Downloads/North_Atlantic_Studies_Metadata/Savepoints/NACCS_DSW.mat"
-OUT_CSV  = Path("DSW_ITCS_TC.csv")
+VARIABLE = "DSW_ITCS"  # struct array, one struct per save point
+FIELD = "TC"  # per-storm DSW of the save point
+N_STORMS = 1050  # expected TC length; None accepts any common length
 
+# IDs of the struct array entries and of the TC columns, written as the HDF5
+# dimension scales. None numbers them 1..n in file order, the 1-based CHS
+# numbering of save points (nodes) and storms (storm_ID in the master track);
+# pass the real ID vectors if the file follows another order.
+NODE_IDS = None
+STORM_IDS = None
 
-mat = loadmat(DATA_PATH, squeeze_me=True, struct_as_record=False)
-print(mat.keys())
+OUTPUT_FORMAT = "hdf5"  # "hdf5" (gzip, chunked) or "npy" (uncompressed, memory-mappable)
+OUT_STORE = Path("DSW_ITCS_TC").with_suffix(".h5" if OUTPUT_FORMAT == "hdf5" else ".npy")
+CHUNK_NODES = 1024  # save points per HDF5 chunk / CSV write
+OUT_CSV = None  # e.g. Path("DSW_ITCS_TC.csv") to also stream the text matrix
 
-m = mat["DSW_ITCS"]
-print(type(m))
-print(m)
-print(m.shape)
 
-m_flat = np.ravel(m)
-s0 = m_flat[0]          # first struct
-print(type(s0))
-print(s0._fieldnames)
+def unpack_struct_field(structs: np.ndarray, field: str, n_columns=None) -> np.ndarray:
+    """
+    One field of a MAT struct array (loaded with struct_as_record=True) as a
+    (n_structs, n_columns) matrix in one preallocated array.
 
-tc = s0.TC
-print(type(tc), getattr(tc, "shape", None))
-print(tc)
-# for tab in m:
-#     print(tab)
+    A struct field is stored per struct (scipy loads it as an object array
+    of separate arrays, v7.3 files as one HDF5 reference per struct), so it
+    cannot be read as a single block: the rows are gathered one by one.
+    Only the length check and the final copy are single array operations.
+    """
+    values = np.ravel(structs[field])
+    sizes = np.fromiter(map(np.size, values), dtype=np.int64, count=values.size)
+    if n_columns is None:
+        n_columns = int(sizes[0]) if sizes.size else 0
+    bad = np.flatnonzero(sizes != n_columns)
+    if bad.size:
+        raise ValueError(
+            f"{bad.size} rows of {field} do not have length {n_columns},"
+            f" e.g. row {bad[0]} has {sizes[bad[0]]}"
+        )
 
-m = mat["DSW_ITCS"]          # ndarray of mat_struct, shape (18977,)
-m_flat = np.ravel(m)
+    dtype = np.result_type(*values[:1]) if values.size else np.float64
+    out = np.empty((values.size, n_columns), dtype=dtype)
+    if values.size:
+        np.stack([np.ravel(v) for v in values], out=out)
+    return out
 
-rows = []
-for i, s in enumerate(m_flat):
-    tc = np.asarray(s.TC).ravel()
 
-    # Optional safety check: all rows must be length 1050
-    if tc.shape != (1050,):
-        raise ValueError(f"Row {i} has TC shape {tc.shape}, expected (1050,)")
+def write_store(
+    arr: np.ndarray,
+    path: Path,
+    output_format: str,
+    chunk_nodes: int,
+    node_ids=None,
+    storm_ids=None,
+) -> None:
+    """
+    Write the (node, storm) matrix to a binary store.
 
-    rows.append(tc)
+    hdf5: dataset '<FIELD>' chunked by save point and gzip-compressed, with
+    'node' and 'storm' ID datasets attached as its dimension scales
+    (node_ids, storm_ids; default 1..n, see NODE_IDS / STORM_IDS).
+    npy: the plain matrix, readable with np.load(path, mmap_mode="r").
+    """
+    if output_format == "npy":
+        np.save(path, arr)
+        return
+    if output_format != "hdf5":
+        raise ValueError(f"output_format must be 'hdf5' or 'npy', got {output_format!r}")
 
-# Stack into a 2D array: (18977, 1050)
-arr = np.vstack(rows)
-print(arr.shape)  # should print (18977, 1050)
+    n_nodes, n_storms = arr.shape
+    scales = []
+    for name, ids, n in [("node", node_ids, n_nodes), ("storm", storm_ids, n_storms)]:
+        ids = np.arange(1, n + 1) if ids is None else np.asarray(ids)
+        if ids.shape != (n,):
+            raise ValueError(f"{name} IDs must have length {n}, got shape {ids.shape}")
+        scales.append((name, ids.astype(np.int64)))
 
-# Save as CSV
-np.savetxt(OUT_CSV, arr, delimiter=",", fmt="%.8e")
-print(f"Wrote {OUT_CSV}")
+    with h5py.File(path, "w") as f:
+        ds = f.create_dataset(
+            FIELD,
+            data=arr,
+            chunks=(max(1, min(chunk_nodes, n_nodes)), max(1, n_storms)),
+            compression="gzip",
+            shuffle=True,
+        )
+        for axis, (name, ids) in enumerate(scales):
+            f[name] = ids
+            f[name].make_scale(name)
+            ds.dims[axis].attach_scale(f[name])
+            ds.dims[axis].label = name
+
+
+def write_csv(arr, path: Path, chunk_nodes: int, fmt: str = "%.8e") -> None:
+    """
+    Stream a (node, storm) matrix to CSV chunk_nodes rows at a time. 'arr'
+    may be an open HDF5 dataset or memory map, so it is never fully loaded.
+    """
+    with open(path, "w") as f:
+        for start in range(0, arr.shape[0], chunk_nodes):
+            np.savetxt(f, arr[start : start + chunk_nodes], delimiter=",", fmt=fmt)
+
+
+def main():
+    mat = loadmat(DATA_PATH, squeeze_me=True, variable_names=[VARIABLE])
+    m = mat[VARIABLE]  # record ndarray of structs, shape (18977,)
+    print(type(m), m.shape, m.dtype.names)
+
+    arr = unpack_struct_field(m, FIELD, N_STORMS)
+    print(arr.shape)  # (18977, 1050) for NACCS
+
+    write_store(arr, OUT_STORE, OUTPUT_FORMAT, CHUNK_NODES, NODE_IDS, STORM_IDS)
+    print(f"Wrote {OUT_STORE}")
+
+    if OUT_CSV is not None:
+        write_csv(arr, OUT_CSV, CHUNK_NODES)
+        print(f"Wrote {OUT_CSV}")
+
+
+if __name__ == "__main__":
+    main()